@@ -3,6 +3,9 @@ import { useState, useEffect, useRef, useCallback, createContext, useContext } f
 // Create WebSocket Context
 const PoseWebSocketContext = createContext(null);
 
+// Pose messages arrive as binary frames holding UTF-8 JSON
+const textDecoder = new TextDecoder();
+
 /**
  * WebSocket Context Provider - Creates ONE connection shared by all components
  */
@@ -45,6 +48,8 @@ export const PoseWebSocketProvider = ({ children, url = 'ws://localhost:8000/ws/
             setError(null);
 
             ws.current = new WebSocket(url);
+            // The server sends JSON as binary frames; read them as ArrayBuffers
+            ws.current.binaryType = 'arraybuffer';
 
             ws.current.onopen = () => {
                 console.log('🔌 Connected to pose tracker! (SHARED CONNECTION)');
@@ -57,7 +62,8 @@ export const PoseWebSocketProvider = ({ children, url = 'ws://localhost:8000/ws/
 
             ws.current.onmessage = (event) => {
                 try {
-                    const data = JSON.parse(event.data);
+                    const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+                    const data = JSON.parse(text);
                     
                     // Validate data structure
                     if (data.players && Array.isArray(data.players) && data.players.length >= 2) {
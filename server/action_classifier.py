@@ -1,11 +1,16 @@
-from typing import List, Dict, Optional
+from itertools import islice
+from typing import Dict, Iterator, Optional, Sequence
 
-def classify_action_simple(angle_history: List[Dict], prev_action: Optional[str] = None) -> str:
+def _recent_frames(angle_history: Sequence[Dict], count: int) -> Iterator[Dict]:
+    """Iterate the last `count` frames without slicing (deques don't support slices)"""
+    return islice(angle_history, max(len(angle_history) - count, 0), None)
+
+def classify_action_simple(angle_history: Sequence[Dict], prev_action: Optional[str] = None) -> str:
     """
     Simple, direct action classification based on current pose.
     
     Args:
-        angle_history: List of dictionaries containing joint angles over time
+        angle_history: Sequence (list or deque) of dictionaries containing joint angles over time
         prev_action: Previous detected action for cooldown logic
         
     Returns:
@@ -106,9 +111,9 @@ def classify_action_simple(angle_history: List[Dict], prev_action: Optional[str]
     alternating_hips = False
     if len(angle_history) >= 3 and left_hip is not None and right_hip is not None:
         # Look at hip angle changes over recent frames to detect alternating pattern
-        recent_left_hips = [frame.get('left_hip_angle') for frame in angle_history[-3:] 
+        recent_left_hips = [frame.get('left_hip_angle') for frame in _recent_frames(angle_history, 3) 
                            if frame.get('left_hip_angle') is not None]
-        recent_right_hips = [frame.get('right_hip_angle') for frame in angle_history[-3:] 
+        recent_right_hips = [frame.get('right_hip_angle') for frame in _recent_frames(angle_history, 3) 
                             if frame.get('right_hip_angle') is not None]
         
         if len(recent_left_hips) >= 3 and len(recent_right_hips) >= 3:
@@ -199,7 +204,7 @@ def classify_action_simple(angle_history: List[Dict], prev_action: Optional[str]
     
     if not cooldown_active and len(angle_history) >= 3:  # Reduced frames needed for faster detection
         # Get hip positions from previous frames
-        prev_frames = angle_history[-3:]  # Look at last 3 frames (faster detection)
+        prev_frames = _recent_frames(angle_history, 3)  # Look at last 3 frames (faster detection)
         hip_y_positions = []
         body_sizes = []
         
@@ -276,12 +281,12 @@ def classify_action_simple(angle_history: List[Dict], prev_action: Optional[str]
     return "unknown"
 
 
-def classify_action_from_history(angle_history: List[Dict], prev_action: Optional[str] = None) -> str:
+def classify_action_from_history(angle_history: Sequence[Dict], prev_action: Optional[str] = None) -> str:
     """
     Simple action classification based on current pose.
     
     Args:
-        angle_history: List of dictionaries containing joint angles over time
+        angle_history: Sequence (list or deque) of dictionaries containing joint angles over time
         prev_action: Previous detected action for cooldown logic
         
     Returns:
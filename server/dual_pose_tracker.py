@@ -1,34 +1,60 @@
 import cv2
 import mediapipe as mp
 import numpy as np
+import os
 import time
 from joint_angle_extractor import JointAngleFeatureExtractor
 from action_classifier import classify_action_from_history
 from collections import deque
 
+# Pose inference backend: "mediapipe" (default) or "onnx" (ONNX Runtime, see onnx_pose_estimator.py)
+POSE_BACKEND = os.environ.get("POSE_BACKEND", "mediapipe")
+POSE_ONNX_MODEL = os.environ.get("POSE_ONNX_MODEL")
+
+# Capture rate requested from the webcam - cap.read() blocks until the next frame, which paces the loop
+CAMERA_FPS = 30
+
+# Action label colors (BGR)
+ACTION_COLORS = {
+    "jump": (0, 255, 255),      # Yellow
+    "run": (0, 255, 0),         # Green  
+    "crouch": (255, 0, 255),    # Magenta
+    "mountain_climber": (0, 165, 255),  # Orange
+    "unknown": (128, 128, 128)     # Gray
+}
+
 class DualPoseTracker:
-    def __init__(self):
+    def __init__(self, pose_backend=POSE_BACKEND):
         # Initialize MediaPipe pose solutions
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        # Create two separate pose estimators for left and right halves
-        self.pose_left = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            smooth_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        
-        self.pose_right = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            smooth_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # Landmark drawing style is constant - build it once instead of every frame
+        self._landmark_style = self.mp_drawing_styles.get_default_pose_landmarks_style()
+        
+        if pose_backend == "onnx":
+            # ONNX Runtime landmark model - stateless, so both halves share one session
+            from onnx_pose_estimator import OnnxPoseEstimator, DEFAULT_ONNX_MODEL
+            self.pose_left = OnnxPoseEstimator(POSE_ONNX_MODEL or DEFAULT_ONNX_MODEL, min_detection_confidence=0.5)
+            self.pose_right = self.pose_left
+        else:
+            # Create two separate pose estimators for left and right halves
+            self.pose_left = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=1,
+                smooth_landmarks=True,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+            
+            self.pose_right = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=1,
+                smooth_landmarks=True,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
         
         # Initialize joint angle feature extractors for both sides
         self.angle_extractor_left = JointAngleFeatureExtractor()
@@ -37,6 +63,7 @@ class DualPoseTracker:
         # Action classification setup - separate for each side
         self.left_angle_history = deque(maxlen=5)   # Store last 5 frames for movement detection
         self.right_angle_history = deque(maxlen=5)  # Store last 5 frames for movement detection
+        self.pose_seq = 0  # Bumped whenever either history gets a new frame of angles
         self.left_action = "unknown"
         self.right_action = "unknown"
         
@@ -63,6 +90,9 @@ class DualPoseTracker:
         self.jump_buffer_length = 0  # NO BUFFER - jump is instantaneous to prevent double jumping
         
         # Simple immediate action detection - no smoothing needed
+        
+        # Action label text sizes, keyed by label text
+        self._action_text_sizes = {}
     
     def add_landmark_positions(self, angles_dict, pose_landmarks):
         """Add landmark Y positions to angles dictionary for jump detection"""
@@ -237,26 +267,25 @@ class DualPoseTracker:
     
 
     
+    def get_action_text_size(self, text):
+        """Measure an action label once and reuse the size on later frames"""
+        text_size = self._action_text_sizes.get(text)
+        if text_size is None:
+            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+            self._action_text_sizes[text] = text_size
+        return text_size
+    
     def draw_action_info(self, frame):
         """Draw the detected actions for both sides on the frame"""
-        # Action colors
-        action_colors = {
-            "jump": (0, 255, 255),      # Yellow
-            "run": (0, 255, 0),         # Green  
-            "crouch": (255, 0, 255),    # Magenta
-            "mountain_climber": (0, 165, 255),  # Orange
-            "unknown": (128, 128, 128)     # Gray
-        }
-        
         frame_width = frame.shape[1]
         frame_height = frame.shape[0]
         
         # === LEFT SIDE ACTION ===
         left_text = f"LEFT: {self.left_action.upper()}"
-        left_color = action_colors.get(self.left_action, (128, 128, 128))
+        left_color = ACTION_COLORS.get(self.left_action, (128, 128, 128))
         
         # Position on left quarter of frame
-        left_text_size = cv2.getTextSize(left_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+        left_text_size = self.get_action_text_size(left_text)
         left_x = (frame_width // 4) - (left_text_size[0] // 2)
         left_y = 100
         
@@ -267,10 +296,10 @@ class DualPoseTracker:
         
         # === RIGHT SIDE ACTION ===
         right_text = f"RIGHT: {self.right_action.upper()}"
-        right_color = action_colors.get(self.right_action, (128, 128, 128))
+        right_color = ACTION_COLORS.get(self.right_action, (128, 128, 128))
         
         # Position on right quarter of frame
-        right_text_size = cv2.getTextSize(right_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+        right_text_size = self.get_action_text_size(right_text)
         right_x = (3 * frame_width // 4) - (right_text_size[0] // 2)
         right_y = 100
         
@@ -293,8 +322,12 @@ class DualPoseTracker:
         right_rgb = cv2.cvtColor(right_half, cv2.COLOR_BGR2RGB)
         
         # Process poses on each half
-        left_results = self.pose_left.process(left_rgb)
-        right_results = self.pose_right.process(right_rgb)
+        if self.pose_left is self.pose_right:
+            # Shared ONNX session - submit both halves together
+            left_results, right_results = self.pose_left.process_pair(left_rgb, right_rgb)
+        else:
+            left_results = self.pose_left.process(left_rgb)
+            right_results = self.pose_right.process(right_rgb)
         
         # Draw landmarks and calculate angles for left half
         left_angles = {}
@@ -303,7 +336,7 @@ class DualPoseTracker:
                 left_half,
                 left_results.pose_landmarks,
                 self.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
+                landmark_drawing_spec=self._landmark_style
             )
             # Calculate joint angles for left side (only returns successfully calculated angles)
             left_angles = self.angle_extractor_left.compute_all_angles(left_results.pose_landmarks)
@@ -318,7 +351,7 @@ class DualPoseTracker:
                 right_half,
                 right_results.pose_landmarks,
                 self.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
+                landmark_drawing_spec=self._landmark_style
             )
             # Calculate joint angles for right side (only returns successfully calculated angles)
             right_angles = self.angle_extractor_right.compute_all_angles(right_results.pose_landmarks)
@@ -338,20 +371,23 @@ class DualPoseTracker:
         if right_angles:  # Only add if we have some angle data
             self.right_angle_history.append(right_angles)
         
+        if left_angles or right_angles:
+            self.pose_seq += 1
+        
         # Run classification every frame for immediate detection
         raw_left_action = "unknown"
         raw_right_action = "unknown"
         
         if len(self.left_angle_history) >= 1:
             try:
-                raw_left_action = classify_action_from_history(list(self.left_angle_history), self.prev_left_action)
+                raw_left_action = classify_action_from_history(self.left_angle_history, self.prev_left_action)
             except Exception as e:
                 print(f"Left side classification error: {e}")
                 raw_left_action = "unknown"
         
         if len(self.right_angle_history) >= 1:
             try:
-                raw_right_action = classify_action_from_history(list(self.right_angle_history), self.prev_right_action)
+                raw_right_action = classify_action_from_history(self.right_angle_history, self.prev_right_action)
             except Exception as e:
                 print(f"Right side classification error: {e}")
                 raw_right_action = "unknown"
@@ -451,6 +487,8 @@ class DualPoseTracker:
             print("Error: Could not open webcam")
             return
         
+        cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+        
         # Give camera time to initialize and warm up
         print("Initializing camera, please wait...")
         time.sleep(2)  # Wait 2 seconds for camera to initialize
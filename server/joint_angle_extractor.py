@@ -1,13 +1,93 @@
 import numpy as np
 import math
+from itertools import chain
+from operator import attrgetter
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - compute_all_angles falls back to NumPy
+    njit = None
+
+# MediaPipe pose model landmark count
+NUM_POSE_LANDMARKS = 33
+
+# Reads (x, y, visibility) off a landmark in a single C-level call
+_landmark_fields = attrgetter('x', 'y', 'visibility')
+
+# Angles measured at the middle landmark of each (point_a, vertex, point_c) triplet
+TRIPLET_ANGLES = [
+    ("left_knee_angle", ('left_hip', 'left_knee', 'left_ankle')),
+    ("right_knee_angle", ('right_hip', 'right_knee', 'right_ankle')),
+    ("left_hip_angle", ('left_shoulder', 'left_hip', 'left_knee')),
+    ("right_hip_angle", ('right_shoulder', 'right_hip', 'right_knee')),
+    ("left_ankle_angle", ('left_knee', 'left_ankle', 'left_foot')),
+    ("right_ankle_angle", ('right_knee', 'right_ankle', 'right_foot')),
+    ("left_elbow_angle", ('left_shoulder', 'left_elbow', 'left_wrist')),
+    ("right_elbow_angle", ('right_shoulder', 'right_elbow', 'right_wrist')),
+    ("left_shoulder_angle", ('left_elbow', 'left_shoulder', 'left_hip')),
+    ("right_shoulder_angle", ('right_elbow', 'right_shoulder', 'right_hip')),
+    ("head_tilt_angle", ('left_shoulder', 'nose', 'right_shoulder')),
+    ("left_shoulder_roll_angle", ('nose', 'left_shoulder', 'left_elbow')),
+    ("right_shoulder_roll_angle", ('nose', 'right_shoulder', 'right_elbow')),
+]
+
+# Row of each angle in TRIPLET_ANGLES
+ANGLE_ROWS = {name: row for row, (name, _) in enumerate(TRIPLET_ANGLES)}
+
+# Face landmarks dropped by JointAngleFeatureExtractor(include_head=False)
+HEAD_LANDMARKS = ('nose', 'left_eye', 'right_eye', 'left_ear', 'right_ear')
+
+def _batch_angles_kernel(coords, triplets, valid, as_cosine, out, ok):
+    """
+    Angle (or cosine) at the vertex of every landmark triplet.
+    Writes ok[i] = False for rows with an unreliable landmark or a zero-length vector.
+    """
+    for i in range(triplets.shape[0]):
+        a = triplets[i, 0]
+        b = triplets[i, 1]
+        c = triplets[i, 2]
+        if not (valid[a] and valid[b] and valid[c]):
+            ok[i] = False
+            continue
+        
+        # Accumulate in float64 - acos is ill-conditioned near a straight limb
+        bx = np.float64(coords[b, 0])
+        by = np.float64(coords[b, 1])
+        bax = np.float64(coords[a, 0]) - bx
+        bay = np.float64(coords[a, 1]) - by
+        bcx = np.float64(coords[c, 0]) - bx
+        bcy = np.float64(coords[c, 1]) - by
+        
+        dot = bax * bcx + bay * bcy
+        norm_sq = (bax * bax + bay * bay) * (bcx * bcx + bcy * bcy)
+        if norm_sq == 0.0:
+            ok[i] = False
+            continue
+        
+        if as_cosine:
+            # |BA| * |BC| == sqrt(|BA|^2 * |BC|^2) - one sqrt instead of two
+            cos_angle = dot / math.sqrt(norm_sq)
+            if cos_angle > 1.0:
+                cos_angle = 1.0
+            elif cos_angle < -1.0:
+                cos_angle = -1.0
+            out[i] = cos_angle
+        else:
+            out[i] = math.degrees(math.atan2(abs(bax * bcy - bay * bcx), dot))
+        ok[i] = True
+
+_batch_angles = njit(cache=True, fastmath=True)(_batch_angles_kernel) if njit is not None else None
 
 class JointAngleFeatureExtractor:
     """
     A class to extract joint angles from MediaPipe pose landmarks.
     Only calculates angles when all required landmarks are reliably detected.
+    
+    With include_head=False the face landmarks are not tracked and
+    compute_all_angles returns body angles only.
     """
     
-    def __init__(self, min_visibility=0.3):
+    def __init__(self, min_visibility=0.3, include_head=True):
         # MediaPipe pose landmark indices
         self.landmark_indices = {
             # Head/Face landmarks
@@ -33,7 +113,65 @@ class JointAngleFeatureExtractor:
             'left_foot': 31,
             'right_foot': 32
         }
+        if not include_head:
+            for name in HEAD_LANDMARKS:
+                del self.landmark_indices[name]
         self.min_visibility = min_visibility
+        self.include_head = include_head
+        
+        # Landmark index table for the single-angle path (None when a landmark is not tracked)
+        self._triplet_rows = [
+            tuple(self.landmark_indices[point] for point in points)
+            if all(point in self.landmark_indices for point in points) else None
+            for _, points in TRIPLET_ANGLES
+        ]
+        
+        # Triplets computable with the tracked landmarks, for the batched path in compute_all_angles
+        batch_angles = [
+            (name, row) for (name, _), row in zip(TRIPLET_ANGLES, self._triplet_rows) if row is not None
+        ]
+        self._angle_names = np.array([name for name, _ in batch_angles])
+        self._triplets = np.array([row for _, row in batch_angles], dtype=np.int32).reshape(-1, 3)
+        
+        # Bitmask of the landmarks each angle needs - an angle is computable when
+        # (required & valid_bits) == required for the frame's reliability bitmask
+        self._angle_masks = [
+            sum(1 << i for i in set(row)) if row is not None else None for row in self._triplet_rows
+        ]
+        self._batch_masks = np.array([sum(1 << i for i in set(row)) for _, row in batch_angles], dtype=np.int64)
+        self._head_mask = sum(1 << self.landmark_indices[name] for name in ('nose', 'left_shoulder', 'right_shoulder')) if include_head else 0
+        
+        # Output buffers for the batched path, reused every frame
+        num_batch = len(batch_angles)
+        self._batch_values = np.empty(num_batch, dtype=np.float64)
+        self._batch_ok = np.empty(num_batch, dtype=np.bool_)
+        
+        # Scratch buffers for the NumPy fallback when numba is not installed
+        self._gather = np.empty((3, num_batch, 2), dtype=np.float32)
+        # All A indices, then all B, then all C - one np.take fills the whole (3, K, 2) gather
+        self._gather_index = np.ascontiguousarray(self._triplets.T).reshape(-1)
+        self._gather_flat = self._gather.reshape(-1, 2)
+        self._vectors = np.empty((2, num_batch, 2), dtype=np.float64)
+        self._dot = np.empty(num_batch, dtype=np.float64)
+        self._norm_sq = np.empty((2, num_batch), dtype=np.float64)
+        self._scratch = np.empty(num_batch, dtype=np.float64)
+        
+        # Landmark cache: x, y, visibility rows plus a reliability mask, parsed
+        # once per public call and shared by every angle that call computes
+        self._cache_points = []
+        self._cache_frame = np.zeros((NUM_POSE_LANDMARKS, 3), dtype=np.float32)
+        self._cache_flat = self._cache_frame.reshape(-1)
+        self._cache_coords = self._cache_frame[:, :2]
+        self._cache_valid = np.zeros(NUM_POSE_LANDMARKS, dtype=np.bool_)
+        self._mask_scratch = np.empty((2, NUM_POSE_LANDMARKS), dtype=np.bool_)
+        self._cache_valid_bits = 0
+        
+        if _batch_angles is not None:
+            # Compile (or load from cache) now rather than on the first real frame,
+            # which would otherwise stall the camera thread; every landmark is
+            # still invalid here, so this only marks each row not computable
+            _batch_angles(self._cache_coords, self._triplets, self._cache_valid, False,
+                          self._batch_values, self._batch_ok)
     
     def is_landmark_reliable(self, landmark):
         """
@@ -52,26 +190,68 @@ class JointAngleFeatureExtractor:
             
         return True
     
+    def prepare(self, landmarks):
+        """
+        Parse a frame's landmarks into the cached coordinate and reliability arrays.
+        Always re-reads the landmarks, so objects mutated in place are never
+        served stale values; every public method calls this once per call.
+        """
+        # One attribute walk over the landmarks: (x, y, visibility) float tuples
+        # for the scalar single-angle path, flattened into the float32 array
+        # used by the batched path
+        fields = landmarks.landmark[:NUM_POSE_LANDMARKS]
+        try:
+            points = list(map(_landmark_fields, fields))
+        except AttributeError:
+            # Landmarks without a visibility field count as visible, as in is_landmark_reliable
+            points = [(lm.x, lm.y, getattr(lm, 'visibility', 1.0)) for lm in fields]
+        count = len(points)
+        if count:
+            self._cache_flat[:3 * count] = np.fromiter(chain.from_iterable(points), np.float32, 3 * count)
+        self._cache_points = points
+        
+        # Same rules as is_landmark_reliable, for every landmark at once,
+        # built in place: visible, not at/below the origin, inside (0, 1)
+        x = self._cache_frame[:, 0]
+        y = self._cache_frame[:, 1]
+        valid = self._cache_valid
+        check, other = self._mask_scratch
+        np.greater_equal(self._cache_frame[:, 2], self.min_visibility, out=valid)
+        np.greater(x, 0.0, out=check)
+        np.greater(y, 0.0, out=other)
+        check |= other
+        valid &= check
+        np.less(x, 1.0, out=check)
+        valid &= check
+        np.less(y, 1.0, out=check)
+        valid &= check
+        valid[count:] = False
+        self._cache_valid_bits = int.from_bytes(np.packbits(self._cache_valid, bitorder='little').tobytes(), 'little')
+    
     def get_landmark_coords(self, landmarks, landmark_name):
         """
-        Extract x, y coordinates from a landmark if it's reliable
+        Extract (x, y) coordinates from a landmark if it's reliable
         Returns None if landmark is missing or unreliable
         """
-        try:
-            idx = self.landmark_indices[landmark_name]
-            landmark = landmarks.landmark[idx]
-            
-            # Check if landmark is reliable enough
-            if not self.is_landmark_reliable(landmark):
-                return None
-                
-            return np.array([landmark.x, landmark.y])
-        except:
+        idx = self.landmark_indices.get(landmark_name)
+        if idx is None or not landmarks:
             return None
+        
+        # Landmarks past the end of a short list are marked unreliable by prepare()
+        self.prepare(landmarks)
+        return self._cached_coords(idx)
+    
+    def _cached_coords(self, idx):
+        """(x, y) of landmark idx from the last prepare(), or None if it is unreliable"""
+        if not self._cache_valid[idx]:
+            return None
+            
+        return self._cache_points[idx][:2]
     
     def calculate_angle(self, point_a, point_b, point_c):
         """
         Calculate angle at point_b formed by points a-b-c
+        Points are (x, y) tuples; plain float math avoids NumPy dispatch on 2-element vectors
         Returns angle in degrees, or None if any point is missing
         """
         # If any point is missing, cannot calculate angle
@@ -79,150 +259,114 @@ class JointAngleFeatureExtractor:
             return None
         
         # Create vectors BA and BC
-        vector_ba = point_a - point_b
-        vector_bc = point_c - point_b
+        bax = point_a[0] - point_b[0]
+        bay = point_a[1] - point_b[1]
+        bcx = point_c[0] - point_b[0]
+        bcy = point_c[1] - point_b[1]
         
-        # Calculate dot product and magnitudes
-        dot_product = np.dot(vector_ba, vector_bc)
-        magnitude_ba = np.linalg.norm(vector_ba)
-        magnitude_bc = np.linalg.norm(vector_bc)
-        
-        # Avoid division by zero
-        if magnitude_ba == 0 or magnitude_bc == 0:
+        # A zero-length vector has no direction
+        if (bax == 0 and bay == 0) or (bcx == 0 and bcy == 0):
             return None
         
-        # Calculate cosine of angle
-        cos_angle = dot_product / (magnitude_ba * magnitude_bc)
-        
-        # Clip cosine value to avoid math domain errors
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
+        # atan2(|cross|, dot) is well conditioned over the whole range, unlike
+        # acos near a straight or fully folded limb, and needs no sqrt or clamp
+        cross_product = bax * bcy - bay * bcx
+        dot_product = bax * bcx + bay * bcy
+        angle_rad = math.atan2(abs(cross_product), dot_product)
         
-        # Calculate angle in radians and convert to degrees
-        angle_rad = math.acos(cos_angle)
+        # Convert to degrees
         angle_deg = math.degrees(angle_rad)
         
         return angle_deg
     
-    def left_knee_angle(self, landmarks):
-        """Calculate left knee angle (hip → knee → ankle) - only if all joints detected"""
-        if not landmarks:
+    def calculate_cos_angle(self, point_a, point_b, point_c):
+        """
+        Calculate the cosine of the angle at point_b formed by points a-b-c
+        Returns cosine in [-1, 1], or None if any point is missing
+        
+        Skips the acos for callers that only compare against thresholds:
+        angle < T is the same test as cos(angle) > cos(T)
+        """
+        if point_a is None or point_b is None or point_c is None:
             return None
         
-        hip = self.get_landmark_coords(landmarks, 'left_hip')
-        knee = self.get_landmark_coords(landmarks, 'left_knee')
-        ankle = self.get_landmark_coords(landmarks, 'left_ankle')
+        bax = point_a[0] - point_b[0]
+        bay = point_a[1] - point_b[1]
+        bcx = point_c[0] - point_b[0]
+        bcy = point_c[1] - point_b[1]
         
-        return self.calculate_angle(hip, knee, ankle)
-    
-    def right_knee_angle(self, landmarks):
-        """Calculate right knee angle (hip → knee → ankle) - only if all joints detected"""
-        if not landmarks:
+        dot_product = bax * bcx + bay * bcy
+        magnitude_ba_sq = bax * bax + bay * bay
+        magnitude_bc_sq = bcx * bcx + bcy * bcy
+        
+        if magnitude_ba_sq == 0 or magnitude_bc_sq == 0:
             return None
         
-        hip = self.get_landmark_coords(landmarks, 'right_hip')
-        knee = self.get_landmark_coords(landmarks, 'right_knee')
-        ankle = self.get_landmark_coords(landmarks, 'right_ankle')
+        cos_angle = dot_product / math.sqrt(magnitude_ba_sq * magnitude_bc_sq)
+        if cos_angle > 1.0:
+            cos_angle = 1.0
+        elif cos_angle < -1.0:
+            cos_angle = -1.0
         
-        return self.calculate_angle(hip, knee, ankle)
+        return cos_angle
     
-    def left_hip_angle(self, landmarks):
-        """Calculate left hip angle (shoulder → hip → knee) - only if all joints detected"""
-        if not landmarks:
+    def _angle_by_row(self, landmarks, row):
+        """Calculate the angle for one TRIPLET_ANGLES row from the cached landmark arrays"""
+        required = self._angle_masks[row]
+        if not landmarks or required is None:
             return None
         
-        shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        hip = self.get_landmark_coords(landmarks, 'left_hip')
-        knee = self.get_landmark_coords(landmarks, 'left_knee')
+        self.prepare(landmarks)
+        if self._cache_valid_bits & required != required:
+            return None
         
-        return self.calculate_angle(shoulder, hip, knee)
+        a, b, c = self._triplet_rows[row]
+        points = self._cache_points
+        return self.calculate_angle(points[a], points[b], points[c])
+    
+    def left_knee_angle(self, landmarks):
+        """Calculate left knee angle (hip → knee → ankle) - only if all joints detected"""
+        return self._angle_by_row(landmarks, ANGLE_ROWS["left_knee_angle"])
+    
+    def right_knee_angle(self, landmarks):
+        """Calculate right knee angle (hip → knee → ankle) - only if all joints detected"""
+        return self._angle_by_row(landmarks, ANGLE_ROWS["right_knee_angle"])
+    
+    def left_hip_angle(self, landmarks):
+        """Calculate left hip angle (shoulder → hip → knee) - only if all joints detected"""
+        return self._angle_by_row(landmarks, ANGLE_ROWS["left_hip_angle"])
     
     def right_hip_angle(self, landmarks):
         """Calculate right hip angle (shoulder → hip → knee) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        hip = self.get_landmark_coords(landmarks, 'right_hip')
-        knee = self.get_landmark_coords(landmarks, 'right_knee')
-        
-        return self.calculate_angle(shoulder, hip, knee)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["right_hip_angle"])
     
     def left_elbow_angle(self, landmarks):
         """Calculate left elbow angle (shoulder → elbow → wrist) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        elbow = self.get_landmark_coords(landmarks, 'left_elbow')
-        wrist = self.get_landmark_coords(landmarks, 'left_wrist')
-        
-        return self.calculate_angle(shoulder, elbow, wrist)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["left_elbow_angle"])
     
     def right_elbow_angle(self, landmarks):
         """Calculate right elbow angle (shoulder → elbow → wrist) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        elbow = self.get_landmark_coords(landmarks, 'right_elbow')
-        wrist = self.get_landmark_coords(landmarks, 'right_wrist')
-        
-        return self.calculate_angle(shoulder, elbow, wrist)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["right_elbow_angle"])
     
     def left_shoulder_angle(self, landmarks):
         """Calculate left shoulder angle (elbow → shoulder → hip) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        elbow = self.get_landmark_coords(landmarks, 'left_elbow')
-        shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        hip = self.get_landmark_coords(landmarks, 'left_hip')
-        
-        return self.calculate_angle(elbow, shoulder, hip)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["left_shoulder_angle"])
     
     def right_shoulder_angle(self, landmarks):
         """Calculate right shoulder angle (elbow → shoulder → hip) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        elbow = self.get_landmark_coords(landmarks, 'right_elbow')
-        shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        hip = self.get_landmark_coords(landmarks, 'right_hip')
-        
-        return self.calculate_angle(elbow, shoulder, hip)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["right_shoulder_angle"])
     
     def left_ankle_angle(self, landmarks):
         """Calculate left ankle angle (knee → ankle → foot) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        knee = self.get_landmark_coords(landmarks, 'left_knee')
-        ankle = self.get_landmark_coords(landmarks, 'left_ankle')
-        foot = self.get_landmark_coords(landmarks, 'left_foot')
-        
-        return self.calculate_angle(knee, ankle, foot)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["left_ankle_angle"])
     
     def right_ankle_angle(self, landmarks):
         """Calculate right ankle angle (knee → ankle → foot) - only if all joints detected"""
-        if not landmarks:
-            return None
-        
-        knee = self.get_landmark_coords(landmarks, 'right_knee')
-        ankle = self.get_landmark_coords(landmarks, 'right_ankle')
-        foot = self.get_landmark_coords(landmarks, 'right_foot')
-        
-        return self.calculate_angle(knee, ankle, foot)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["right_ankle_angle"])
     
     def head_tilt_angle(self, landmarks):
         """Calculate head tilt angle (left_shoulder → nose → right_shoulder) - side to side head tilt"""
-        if not landmarks:
-            return None
-        
-        left_shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        nose = self.get_landmark_coords(landmarks, 'nose')
-        right_shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        
-        return self.calculate_angle(left_shoulder, nose, right_shoulder)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["head_tilt_angle"])
     
     def head_turn_angle(self, landmarks):
         """Calculate head turn angle relative to shoulder orientation (body reference frame)
@@ -235,55 +379,40 @@ class JointAngleFeatureExtractor:
             return None
         
         # Get required landmarks
-        left_shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        right_shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        nose = self.get_landmark_coords(landmarks, 'nose')
+        self.prepare(landmarks)
+        left_shoulder = self._cached_coords(self.landmark_indices['left_shoulder'])
+        right_shoulder = self._cached_coords(self.landmark_indices['right_shoulder'])
+        nose = self._cached_coords(self.landmark_indices['nose'])
         
         if left_shoulder is None or right_shoulder is None or nose is None:
             return None
         
-        # 1. Calculate shoulder center (body center point)
-        shoulder_center = (left_shoulder + right_shoulder) / 2
-        
-        # 2. Calculate shoulder line vector (left to right shoulder)
-        shoulder_vector = right_shoulder - left_shoulder
-        shoulder_length = np.linalg.norm(shoulder_vector)
+        return self._head_turn_from_points(left_shoulder, right_shoulder, nose)
+    
+    def _head_turn_from_points(self, left_shoulder, right_shoulder, nose):
+        """Head turn angle from reliable (x, y) shoulder and nose points (see head_turn_angle)"""
+        # 1. Shoulder center (body center point) and shoulder line (left to right)
+        shoulder_center_x = 0.5 * (left_shoulder[0] + right_shoulder[0])
+        shoulder_center_y = 0.5 * (left_shoulder[1] + right_shoulder[1])
+        shoulder_x = right_shoulder[0] - left_shoulder[0]
+        shoulder_y = right_shoulder[1] - left_shoulder[1]
+        shoulder_length = math.hypot(shoulder_x, shoulder_y)
         
         if shoulder_length == 0:
             return 0.0  # Shoulders at same position, can't determine orientation
         
-        # 3. Calculate the "forward" direction perpendicular to shoulders
-        # Rotate the shoulder vector 90 degrees counterclockwise to get forward direction
-        # If shoulder vector is [x, y], then perpendicular is [-y, x]
-        forward_vector = np.array([-shoulder_vector[1], shoulder_vector[0]])
-        forward_length = np.linalg.norm(forward_vector)
-        
-        if forward_length == 0:
-            return 0.0
-        
-        # 4. Normalize the forward vector
-        forward_unit = forward_vector / forward_length
+        # 2. Project the nose offset onto the shoulder line to get left-right deviation
+        lateral_deviation = ((nose[0] - shoulder_center_x) * shoulder_x +
+                             (nose[1] - shoulder_center_y) * shoulder_y) / shoulder_length
         
-        # 5. Calculate where nose "should be" if looking straight ahead
-        # Project some distance forward from shoulder center
-        expected_nose_distance = 0.1  # Arbitrary forward distance
-        expected_nose_position = shoulder_center + (forward_unit * expected_nose_distance)
+        # 3. Normalize the deviation relative to half the shoulder width
+        normalized_deviation = 2.0 * lateral_deviation / shoulder_length
         
-        # 6. Calculate actual nose offset from shoulder center
-        actual_nose_vector = nose - shoulder_center
-        
-        # 7. Project nose position onto shoulder line to get left-right deviation
-        shoulder_unit = shoulder_vector / shoulder_length
-        lateral_deviation = np.dot(actual_nose_vector, shoulder_unit)
-        
-        # 8. Normalize the deviation relative to shoulder width
-        normalized_deviation = lateral_deviation / (shoulder_length / 2)
-        
-        # 9. Convert to degrees
+        # 4. Convert to degrees
         max_turn_angle = 45.0  # Maximum detectable turn
         turn_angle = abs(normalized_deviation) * max_turn_angle
         
-        # 10. Determine direction based on shoulder coordinate system
+        # 5. Determine direction based on shoulder coordinate system
         # Positive lateral_deviation = moved toward right shoulder = RIGHT turn
         # Negative lateral_deviation = moved toward left shoulder = LEFT turn
         if lateral_deviation > 0:
@@ -296,68 +425,128 @@ class JointAngleFeatureExtractor:
         if not landmarks:
             return None
         
-        left_shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        right_shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        nose = self.get_landmark_coords(landmarks, 'nose')
+        self.prepare(landmarks)
+        left_shoulder = self._cached_coords(self.landmark_indices['left_shoulder'])
+        right_shoulder = self._cached_coords(self.landmark_indices['right_shoulder'])
+        nose = self._cached_coords(self.landmark_indices['nose'])
         
-        # Calculate center point between shoulders
         if left_shoulder is None or right_shoulder is None or nose is None:
             return None
-            
-        shoulder_center = (left_shoulder + right_shoulder) / 2
         
-        # Create a vertical reference point below the shoulder center
-        vertical_ref = np.array([shoulder_center[0], shoulder_center[1] + 0.1])  # Point directly below
+        return self._neck_from_points(left_shoulder, right_shoulder, nose)
+    
+    def _neck_from_points(self, left_shoulder, right_shoulder, nose):
+        """Neck angle from reliable (x, y) shoulder and nose points (see neck_angle)"""
+        # Calculate center point between shoulders
+        shoulder_center_x = (left_shoulder[0] + right_shoulder[0]) / 2
+        shoulder_center_y = (left_shoulder[1] + right_shoulder[1]) / 2
+        
+        # Vector from the shoulder center to the nose
+        neck_x = nose[0] - shoulder_center_x
+        neck_y = nose[1] - shoulder_center_y
+        if neck_x == 0 and neck_y == 0:
+            return None
         
-        return self.calculate_angle(vertical_ref, shoulder_center, nose)
+        # Angle against straight down (+y in image coordinates)
+        return math.degrees(math.atan2(abs(neck_x), neck_y))
     
     def left_shoulder_roll_angle(self, landmarks):
         """Calculate left shoulder roll angle (nose → left_shoulder → left_elbow) - shoulder elevation"""
-        if not landmarks:
-            return None
-        
-        nose = self.get_landmark_coords(landmarks, 'nose')
-        left_shoulder = self.get_landmark_coords(landmarks, 'left_shoulder')
-        left_elbow = self.get_landmark_coords(landmarks, 'left_elbow')
-        
-        return self.calculate_angle(nose, left_shoulder, left_elbow)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["left_shoulder_roll_angle"])
     
     def right_shoulder_roll_angle(self, landmarks):
         """Calculate right shoulder roll angle (nose → right_shoulder → right_elbow) - shoulder elevation"""
-        if not landmarks:
-            return None
-        
-        nose = self.get_landmark_coords(landmarks, 'nose')
-        right_shoulder = self.get_landmark_coords(landmarks, 'right_shoulder')
-        right_elbow = self.get_landmark_coords(landmarks, 'right_elbow')
-        
-        return self.calculate_angle(nose, right_shoulder, right_elbow)
+        return self._angle_by_row(landmarks, ANGLE_ROWS["right_shoulder_roll_angle"])
     
-    def compute_all_angles(self, landmarks):
+    def compute_all_angles(self, landmarks, as_cosine=False):
         """
         Compute all joint angles and return as a dictionary
         Only includes angles where all required joints were detected
-        """
-        all_angles = {
-            # Existing joint angles
-            "left_knee_angle": self.left_knee_angle(landmarks),
-            "right_knee_angle": self.right_knee_angle(landmarks),
-            "left_hip_angle": self.left_hip_angle(landmarks),
-            "right_hip_angle": self.right_hip_angle(landmarks),
-            "left_ankle_angle": self.left_ankle_angle(landmarks),
-            "right_ankle_angle": self.right_ankle_angle(landmarks),
-            "left_elbow_angle": self.left_elbow_angle(landmarks),
-            "right_elbow_angle": self.right_elbow_angle(landmarks),
-            "left_shoulder_angle": self.left_shoulder_angle(landmarks),
-            "right_shoulder_angle": self.right_shoulder_angle(landmarks),
-            # NEW: Head and neck tracking angles
-            "head_tilt_angle": self.head_tilt_angle(landmarks),
-            "head_turn_angle": self.head_turn_angle(landmarks),
-            "neck_angle": self.neck_angle(landmarks),
-            "left_shoulder_roll_angle": self.left_shoulder_roll_angle(landmarks),
-            "right_shoulder_roll_angle": self.right_shoulder_roll_angle(landmarks)
-        }
         
-        # Only return angles that were successfully calculated (not None)
-        valid_angles = {k: v for k, v in all_angles.items() if v is not None}
-        return valid_angles 
\ No newline at end of file
+        All vertex angles are computed in one vectorized pass over the
+        landmark array instead of one method call per angle. With
+        as_cosine=True the vertex angles are returned as cosines (no arccos)
+        and the non-vertex head turn / neck angles are left out, as are
+        all head angles when the extractor was built with include_head=False.
+        """
+        if not landmarks:
+            return {}
+        
+        # Parse this frame's landmarks once for every angle below
+        self.prepare(landmarks)
+        coords = self._cache_coords
+        valid = self._cache_valid
+        
+        # Nothing to compute if no angle has all of its landmarks (e.g. player out of frame)
+        valid_bits = self._cache_valid_bits
+        masks = self._batch_masks
+        reliable = (masks & valid_bits) == masks
+        head_reliable = self._head_mask != 0 and valid_bits & self._head_mask == self._head_mask
+        if not reliable.any() and not head_reliable:
+            return {}
+        
+        if _batch_angles is not None:
+            # Compiled kernel: one native loop over all triplets
+            _batch_angles(coords, self._triplets, valid, as_cosine, self._batch_values, self._batch_ok)
+            computable = self._batch_ok
+            values = self._batch_values[computable]
+        else:
+            # Gather A, B, C in one pass and build vectors BA and BC for every triplet, in place
+            np.take(coords, self._gather_index, axis=0, out=self._gather_flat)
+            A, B, C = self._gather
+            # Accumulate in float64 like the compiled kernel
+            BA, BC = self._vectors
+            np.subtract(A, B, out=BA, dtype=np.float64)
+            np.subtract(C, B, out=BC, dtype=np.float64)
+            
+            dot = np.einsum('ij,ij->i', BA, BC, out=self._dot)
+            norm_ba, norm_bc = self._norm_sq
+            np.einsum('ij,ij->i', BA, BA, out=norm_ba)
+            np.einsum('ij,ij->i', BC, BC, out=norm_bc)
+            norm_sq = np.multiply(norm_ba, norm_bc, out=norm_ba)
+            
+            # Only angles whose landmarks are reliable and non-degenerate
+            computable = np.greater(norm_sq, 0.0, out=self._batch_ok)
+            computable &= reliable
+            
+            values = self._batch_values
+            scratch = self._scratch
+            if as_cosine:
+                np.sqrt(norm_sq, out=scratch)
+                np.divide(dot, scratch, out=values, where=computable)
+                np.clip(values, -1.0, 1.0, out=values)
+            else:
+                # |BA x BC| (norm_bc is free again once norm_sq is formed)
+                np.multiply(BA[:, 0], BC[:, 1], out=scratch)
+                np.multiply(BA[:, 1], BC[:, 0], out=norm_bc)
+                np.subtract(scratch, norm_bc, out=scratch)
+                np.abs(scratch, out=scratch)
+                np.arctan2(scratch, dot, out=values)
+                np.degrees(values, out=values)
+            values = values[computable]
+        
+        valid_angles = dict(zip(self._angle_names[computable].tolist(), values.tolist()))
+        if as_cosine or not head_reliable:
+            return valid_angles
+        
+        # Head turn and neck lean are not vertex angles. Their landmarks were
+        # checked through head_reliable, so use the cached points directly
+        # rather than going through the public methods' guards again
+        points = self._cache_points
+        indices = self.landmark_indices
+        left_shoulder = points[indices['left_shoulder']]
+        right_shoulder = points[indices['right_shoulder']]
+        nose = points[indices['nose']]
+        valid_angles["head_turn_angle"] = self._head_turn_from_points(left_shoulder, right_shoulder, nose)
+        neck = self._neck_from_points(left_shoulder, right_shoulder, nose)
+        if neck is not None:
+            valid_angles["neck_angle"] = neck
+        
+        return valid_angles
+    
+    def compute_all_cosines(self, landmarks):
+        """
+        Compute the cosine of every vertex joint angle (see compute_all_angles)
+        Compare against precomputed thresholds, e.g. math.cos(math.radians(160))
+        """
+        return self.compute_all_angles(landmarks, as_cosine=True)
@@ -0,0 +1,192 @@
+import argparse
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+# BlazePose landmark model input resolution and output layout
+MODEL_INPUT_SIZE = 256
+NUM_POSE_LANDMARKS = 33
+LANDMARK_VALUES = 5  # x, y, z, visibility logit, presence logit
+
+DEFAULT_ONNX_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "pose_landmark_full_int8.onnx")
+
+# Execution providers in order of preference; unavailable ones are skipped
+PREFERRED_PROVIDERS = ('CUDAExecutionProvider', 'CPUExecutionProvider')
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class OnnxPoseEstimator:
+    """
+    Drop-in replacement for mediapipe.solutions.pose.Pose backed by ONNX Runtime.
+
+    Runs the BlazePose landmark network exported by convert_model() and does
+    the pre/post-processing MediaPipe used to do (letterboxing, [0, 1]
+    normalization, landmark decoding). The detector/ROI-tracking stage is
+    skipped: each half-frame holds a single player, so the whole letterboxed
+    half is used as the region of interest.
+
+    Runs on the CUDA execution provider only when onnxruntime-gpu is installed
+    in place of the CPU onnxruntime package (see the README); otherwise CPU.
+    """
+
+    def __init__(self, model_path=DEFAULT_ONNX_MODEL, min_detection_confidence=0.5, providers=PREFERRED_PROVIDERS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        options.enable_cpu_mem_arena = True
+
+        # Use the GPU when onnxruntime-gpu is installed, otherwise fall back to CPU
+        available = ort.get_available_providers()
+        providers = [p for p in providers if p in available] or ['CPUExecutionProvider']
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=providers)
+        self.min_detection_confidence = min_detection_confidence
+        self.on_gpu = self.session.get_providers()[0] != 'CPUExecutionProvider'
+        print(f"🧠 ONNX pose model {os.path.basename(model_path)} running on {self.session.get_providers()[0]}")
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Both halves go through in one run when the exported model has a dynamic batch dimension
+        self.supports_batch = not isinstance(model_input.shape[0], int)
+
+        # Resolve outputs by shape rather than name - tf2onnx keeps the TFLite
+        # names ("Identity", "Identity_1", ...) but they carry no meaning
+        self.landmarks_output = None
+        self.presence_output = None
+        for output in self.session.get_outputs():
+            last_dim = output.shape[-1] if output.shape else None
+            if last_dim == (NUM_POSE_LANDMARKS + 6) * LANDMARK_VALUES and self.landmarks_output is None:
+                self.landmarks_output = output.name
+            elif last_dim == 1 and len(output.shape) == 2 and self.presence_output is None:
+                self.presence_output = output.name
+
+        if self.landmarks_output is None or self.presence_output is None:
+            raise ValueError(f"{model_path} does not look like a BlazePose landmark model")
+
+        # Reused letterbox canvas for the model input (room for a left/right batch)
+        self._input = np.zeros((2, MODEL_INPUT_SIZE, MODEL_INPUT_SIZE, 3), dtype=np.float32)
+
+        # On the GPU, bind the host canvas directly and let ORT copy outputs
+        # back to host memory instead of building new feeds every run
+        self._binding = self.session.io_binding() if self.on_gpu else None
+
+    def _preprocess(self, image, slot=0):
+        """Letterbox an RGB image into the model input; returns (scale, pad_x, pad_y, width, height)"""
+        height, width = image.shape[:2]
+        scale = MODEL_INPUT_SIZE / max(height, width)
+        new_w, new_h = int(round(width * scale)), int(round(height * scale))
+        pad_x = (MODEL_INPUT_SIZE - new_w) // 2
+        pad_y = (MODEL_INPUT_SIZE - new_h) // 2
+
+        resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        self._input[slot].fill(0.0)
+        np.multiply(resized, 1.0 / 255.0, out=self._input[slot, pad_y:pad_y + new_h, pad_x:pad_x + new_w], casting='unsafe')
+        return scale, pad_x, pad_y, width, height
+
+    def _decode(self, raw_landmarks, presence, scale, pad_x, pad_y, width, height):
+        """Convert raw model outputs into a NormalizedLandmarkList (or None)"""
+        if float(presence) < self.min_detection_confidence:
+            return None
+
+        values = raw_landmarks.reshape(-1, LANDMARK_VALUES)[:NUM_POSE_LANDMARKS]
+
+        # Undo letterboxing: model pixels -> image pixels -> normalized [0, 1]
+        xs = (values[:, 0] - pad_x) / scale / width
+        ys = (values[:, 1] - pad_y) / scale / height
+        zs = values[:, 2] / scale / width
+        visibility = _sigmoid(values[:, 3])
+        presence_scores = _sigmoid(values[:, 4])
+
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, vis, pres in zip(xs.tolist(), ys.tolist(), zs.tolist(), visibility.tolist(), presence_scores.tolist()):
+            landmark_list.landmark.add(x=x, y=y, z=z, visibility=vis, presence=pres)
+        return landmark_list
+
+    def _run(self, batch):
+        """Run the model on the first `batch` slots of the input canvas"""
+        inputs = self._input[:batch]
+        if self._binding is None:
+            return self.session.run([self.landmarks_output, self.presence_output], {self.input_name: inputs})
+
+        self._binding.bind_cpu_input(self.input_name, inputs)
+        self._binding.bind_output(self.landmarks_output)
+        self._binding.bind_output(self.presence_output)
+        self.session.run_with_iobinding(self._binding)
+        return self._binding.copy_outputs_to_cpu()
+
+    def process(self, image):
+        """Run pose estimation on an RGB image; mirrors mp.solutions.pose.Pose.process()"""
+        geometry = self._preprocess(image)
+        raw_landmarks, presence = self._run(1)
+        pose_landmarks = self._decode(raw_landmarks[0], presence.reshape(-1)[0], *geometry)
+        return SimpleNamespace(pose_landmarks=pose_landmarks)
+
+    def process_pair(self, left_image, right_image):
+        """Run pose estimation on both half-frames, as a single batch when the model allows it"""
+        if not self.supports_batch:
+            return self.process(left_image), self.process(right_image)
+
+        left_geometry = self._preprocess(left_image, 0)
+        right_geometry = self._preprocess(right_image, 1)
+        raw_landmarks, presence = self._run(2)
+        presence = presence.reshape(-1)
+        return (
+            SimpleNamespace(pose_landmarks=self._decode(raw_landmarks[0], presence[0], *left_geometry)),
+            SimpleNamespace(pose_landmarks=self._decode(raw_landmarks[1], presence[1], *right_geometry)),
+        )
+
+    def close(self):
+        """Release the inference session"""
+        self._binding = None
+        self.session = None
+
+
+def convert_model(tflite_path, output_path, quantize="int8"):
+    """
+    One-time offline conversion of MediaPipe's pose_landmark_full.tflite to ONNX.
+
+    Args:
+        tflite_path: Path to pose_landmark_full.tflite (ships inside the mediapipe package)
+        output_path: Where to write the ONNX model
+        quantize: "int8" (dynamic weight quantization), "fp16", or "none"
+    """
+    import tf2onnx
+
+    fp32_path = output_path if quantize == "none" else output_path + ".fp32.onnx"
+    tf2onnx.convert.from_tflite(tflite_path, output_path=fp32_path)
+
+    if quantize == "int8":
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QUInt8)
+        os.remove(fp32_path)
+    elif quantize == "fp16":
+        import onnx
+        from onnxconverter_common import float16
+        model = onnx.load(fp32_path)
+        onnx.save(float16.convert_float_to_float16(model, keep_io_types=True), output_path)
+        os.remove(fp32_path)
+
+    print(f"✅ Wrote {quantize} ONNX pose model to {output_path}")
+
+
+if __name__ == "__main__":
+    import mediapipe as mp
+
+    default_tflite = os.path.join(os.path.dirname(mp.__file__), "modules", "pose_landmark", "pose_landmark_full.tflite")
+
+    parser = argparse.ArgumentParser(description="Convert the MediaPipe pose landmark model to ONNX")
+    parser.add_argument("--tflite", default=default_tflite, help="Path to pose_landmark_full.tflite")
+    parser.add_argument("--output", default=DEFAULT_ONNX_MODEL, help="Output ONNX model path")
+    parser.add_argument("--quantize", choices=["int8", "fp16", "none"], default="int8")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    convert_model(args.tflite, args.output, args.quantize)
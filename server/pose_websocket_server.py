@@ -1,20 +1,48 @@
 import asyncio
-import json
+import queue
+import sys
+import threading
 import time
+from collections import deque
+import msgspec
+import orjson
 import cv2
-from typing import Dict, List, Optional, Any, Union
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Union, Callable, Awaitable
+from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
+from starlette.websockets import WebSocketState
 import os
 import uvicorn
 
 # Import our pose tracking modules
-from dual_pose_tracker import DualPoseTracker
+from dual_pose_tracker import DualPoseTracker, CAMERA_FPS
 
 # Configuration for WebSocket broadcast frequency
 WEBSOCKET_BROADCAST_FPS = 10  # Reduce from 30 FPS to prevent lag (recommended: 8-12 FPS)
 
+# WebSocket admission limits: connection attempts per client IP within a sliding
+# window, and a hard cap on concurrent clients (bounds the broadcast fan-out)
+CONNECT_RATE_LIMIT = int(os.environ.get("POSE_CONNECT_RATE_LIMIT", "10"))
+CONNECT_RATE_WINDOW = float(os.environ.get("POSE_CONNECT_RATE_WINDOW", "60"))
+MAX_CLIENTS = int(os.environ.get("POSE_MAX_CLIENTS", "64"))
+
+# Show the annotated camera feed in an OpenCV window (off by default; set POSE_DEBUG_DISPLAY=1)
+DEBUG_DISPLAY = os.environ.get("POSE_DEBUG_DISPLAY", "0") == "1"
+
+# The preview window runs on a background thread (the main thread belongs to
+# uvicorn), and macOS only allows HighGUI/Cocoa windows on the main thread
+if DEBUG_DISPLAY and sys.platform == "darwin":
+    raise RuntimeError("POSE_DEBUG_DISPLAY=1 is not supported on macOS: OpenCV windows must run on the "
+                       "main thread there, which is owned by the server. Unset POSE_DEBUG_DISPLAY.")
+
+# Bind to loopback by default; TLS and public exposure are handled by a reverse
+# proxy in front of the server (see the Deployment section of the README)
+SERVER_HOST = os.environ.get("POSE_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("POSE_SERVER_PORT", "8000"))
+
 app = FastAPI(title="Pose Tracker WebSocket Server")
 
 # Add CORS middleware
@@ -26,145 +54,353 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Wire formats a client can pick with ws://.../ws/pose?format=...
+# Both are sent as binary frames: "json" carries UTF-8 JSON, "msgpack" carries a
+# compact MessagePack version of the same schema (see compact_pose_data)
+WIRE_FORMATS = ("json", "msgpack")
+
+def _encode_numpy(obj):
+    """msgspec fallback for NumPy values, mirroring orjson.OPT_SERIALIZE_NUMPY on the JSON path"""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise NotImplementedError(f"Cannot encode {type(obj).__name__}")
+
+msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=_encode_numpy)
+
+# Reference point for the compact format's millisecond timestamps
+SERVER_START_TIME = time.time()
+
+def _decidegrees(angle: Optional[float]) -> Optional[int]:
+    return None if angle is None else round(float(angle) * 10)
+
+def compact_pose_data(data: Dict) -> Dict:
+    """
+    Compact wire form of extract_pose_data()'s output for the msgpack format:
+    angles become integer tenths of a degree (fits int16) and timestamps become
+    integer milliseconds since server start (fits uint32), so MessagePack packs
+    them in 2-5 bytes instead of 9-byte floats. Clients divide by 10 / 1000.
+    """
+    players = []
+    for player in data["players"]:
+        head = player["head"]
+        arms = player["arms"]
+        players.append({
+            "player": player["player"],
+            "action": player["action"],
+            "speed": player["speed"],
+            "head": {axis: _decidegrees(angle) for axis, angle in head.items()},
+            "arms": {
+                side: {joint: _decidegrees(angle) for joint, angle in arm.items()}
+                for side, arm in arms.items()
+            },
+            "timestamp": round((player["timestamp"] - SERVER_START_TIME) * 1000)
+        })
+    
+    return {
+        "players": players,
+        "timestamp": round((data["timestamp"] - SERVER_START_TIME) * 1000),
+        "debug": data["debug"]
+    }
+
+def encode_message(data: Dict, wire_format: str = "json") -> bytes:
+    """Serialize pose data for the given wire format (UTF-8 JSON or compact MessagePack bytes)"""
+    if wire_format == "msgpack":
+        return msgpack_encoder.encode(compact_pose_data(data))
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def asgi_sender(websocket: WebSocket) -> Callable[[Dict], Awaitable[None]]:
+    """
+    The ASGI send callable behind a WebSocket, for the broadcast hot path.
+    
+    Starlette keeps it as the private WebSocket._send; calling it directly skips
+    the wrapper's per-call state machine. If a Starlette release renames it, fall
+    back to the public websocket.send, which takes the same event dicts.
+    """
+    send = getattr(websocket, "_send", None)
+    return send if callable(send) else websocket.send
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.connection_formats: Dict[WebSocket, str] = {}
+        # Each client's raw ASGI send callable, for the broadcast hot path
+        self.connection_senders: Dict[WebSocket, Callable[[Dict], Awaitable[None]]] = {}
         self.latest_pose_data: Optional[Dict] = None
+        # Encodings of latest_pose_data per wire format
+        self.latest_messages: Dict[str, bytes] = {}
+    
+    def get_message(self, wire_format: str) -> bytes:
+        """Encoded latest_pose_data for a wire format, encoding at most once per payload"""
+        message = self.latest_messages.get(wire_format)
+        if message is None:
+            message = self.latest_messages[wire_format] = encode_message(self.latest_pose_data, wire_format)
+        return message
     
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, wire_format: str = "json"):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self.connection_formats[websocket] = wire_format
+        # Raw ASGI send where available (the connection state is checked once per
+        # broadcast instead of by Starlette on every send)
+        self.connection_senders[websocket] = asgi_sender(websocket)
         if self.latest_pose_data:
             try:
-                await websocket.send_text(json.dumps(self.latest_pose_data))
+                await websocket.send_bytes(self.get_message(wire_format))
             except:
                 pass
     
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self.connection_formats.pop(websocket, None)
+        self.connection_senders.pop(websocket, None)
     
     async def broadcast(self, data: Dict):
         self.latest_pose_data = data
-        if not self.active_connections:
+        self.latest_messages = {}
+        await self.broadcast_latest()
+    
+    async def broadcast_latest(self):
+        """Send latest_pose_data to every client, reusing its existing encodings"""
+        if not self.active_connections or self.latest_pose_data is None:
             return
         
-        message = json.dumps(data)
-        disconnected = []
+        # Snapshot the list - clients may connect or disconnect while sends are in flight.
+        # Clients already known to be closed are dropped up front rather than by
+        # letting their send raise
+        connections = []
+        for connection in tuple(self.active_connections):
+            if connection.client_state == WebSocketState.CONNECTED and connection.application_state == WebSocketState.CONNECTED:
+                connections.append(connection)
+            else:
+                self.disconnect(connection)
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                disconnected.append(connection)
+        # Encode once per wire format in use, shared by every client on that format,
+        # as a ready-made ASGI binary-frame event (binary skips the per-client UTF-8 encode)
+        events: Dict[str, Dict] = {}
+        sends = []
+        for connection in connections:
+            wire_format = self.connection_formats.get(connection, "json")
+            event = events.get(wire_format)
+            if event is None:
+                event = events[wire_format] = {"type": "websocket.send", "bytes": self.get_message(wire_format)}
+            sends.append(self.connection_senders[connection](event))
         
-        for connection in disconnected:
-            self.disconnect(connection)
+        # Send to all clients concurrently so one slow socket doesn't hold up the rest;
+        # a client that closes mid-send (rare race) still surfaces as an exception here
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        
+        for connection, result in zip(connections, results):
+            if result is not None:
+                # The raw send bypasses Starlette's bookkeeping, so record the
+                # closed socket the way WebSocket.send would have
+                connection.application_state = WebSocketState.DISCONNECTED
+                self.disconnect(connection)
 
 manager = ConnectionManager()
-pose_tracker = None
 
-def extract_player_data(angles_dict, action, player_id) -> Dict[str, Any]:
-    """Extract data for a single player"""
+class RateLimiter:
+    """Sliding-window limiter: at most max_events per key within window_seconds"""
     
-    # Extract head angles
-    head_data: Dict[str, Optional[float]] = {"pitch": None, "yaw": None, "roll": None}
+    def __init__(self, max_events: int, window_seconds: float):
+        self.max_events = max_events
+        self.window_seconds = window_seconds
+        self.events: Dict[str, deque] = {}
+    
+    def allow(self, key: str) -> bool:
+        """Record an event for key; returns False if it exceeds the limit"""
+        now = time.monotonic()
+        events = self.events.get(key)
+        if events is None:
+            events = self.events[key] = deque()
+        
+        # Drop events that have left the window
+        cutoff = now - self.window_seconds
+        while events and events[0] <= cutoff:
+            events.popleft()
+        
+        if len(events) >= self.max_events:
+            return False
+        events.append(now)
+        return True
     
-    if 'head_tilt_angle' in angles_dict and angles_dict['head_tilt_angle'] is not None:
-        head_data["pitch"] = float(angles_dict['head_tilt_angle'])
+    def prune(self):
+        """Forget keys with no events left in the window"""
+        cutoff = time.monotonic() - self.window_seconds
+        for key in [key for key, events in self.events.items() if not events or events[-1] <= cutoff]:
+            del self.events[key]
+
+connect_limiter = RateLimiter(CONNECT_RATE_LIMIT, CONNECT_RATE_WINDOW)
+
+async def prune_limiter_loop():
+    """Periodically drop stale per-IP rate limiter state"""
+    try:
+        while True:
+            await asyncio.sleep(60)
+            connect_limiter.prune()
+    except asyncio.CancelledError:
+        pass
+pose_tracker = None
+
+# Display speed reported for each action (anything else is standing still)
+ACTION_SPEEDS = {
+    "run": 8.5,
+    "jump": 5.0,
+    "mountain_climber": 6.0,
+    "crouch": 1.0,
+}
+
+# Tracker action names that go out on the wire under a different value
+WIRE_ACTIONS = {
+    "unknown": None,
+}
+
+def extract_player_data(angles_dict, action, player_id, now: float) -> Dict[str, Any]:
+    """Extract data for a single player (now: the frame's shared timestamp)"""
     
-    if 'head_turn_angle' in angles_dict and angles_dict['head_turn_angle'] is not None:
-        head_data["yaw"] = float(angles_dict['head_turn_angle'])
+    # Angles are plain floats from the extractor; missing ones come back as None
+    get_angle = angles_dict.get
     
-    if 'neck_angle' in angles_dict and angles_dict['neck_angle'] is not None:
-        head_data["roll"] = float(angles_dict['neck_angle'])
+    # Extract head angles
+    head_data: Dict[str, Optional[float]] = {
+        "pitch": get_angle('head_tilt_angle'),
+        "yaw": get_angle('head_turn_angle'),
+        "roll": get_angle('neck_angle')
+    }
     
     # Extract arm angles
     arms_data: Dict[str, Dict[str, Optional[float]]] = {
         "left": {
-            "shoulder_angle": None,
-            "elbow_angle": None
+            "shoulder_angle": get_angle('left_shoulder_angle'),
+            "elbow_angle": get_angle('left_elbow_angle')
         },
         "right": {
-            "shoulder_angle": None,
-            "elbow_angle": None
+            "shoulder_angle": get_angle('right_shoulder_angle'),
+            "elbow_angle": get_angle('right_elbow_angle')
         }
     }
     
-    # Left arm
-    if 'left_shoulder_angle' in angles_dict and angles_dict['left_shoulder_angle'] is not None:
-        arms_data["left"]["shoulder_angle"] = float(angles_dict['left_shoulder_angle'])
-    if 'left_elbow_angle' in angles_dict and angles_dict['left_elbow_angle'] is not None:
-        arms_data["left"]["elbow_angle"] = float(angles_dict['left_elbow_angle'])
-    
-    # Right arm
-    if 'right_shoulder_angle' in angles_dict and angles_dict['right_shoulder_angle'] is not None:
-        arms_data["right"]["shoulder_angle"] = float(angles_dict['right_shoulder_angle'])
-    if 'right_elbow_angle' in angles_dict and angles_dict['right_elbow_angle'] is not None:
-        arms_data["right"]["elbow_angle"] = float(angles_dict['right_elbow_angle'])
-    
-    # Calculate speed based on action
-    speed = 0.0
-    if action == "run":
-        speed = 8.5
-    elif action == "jump":
-        speed = 5.0
-    elif action == "mountain_climber":
-        speed = 6.0
-    elif action == "crouch":
-        speed = 1.0
-    
     return {
         "player": player_id,
-        "action": action if action != "unknown" else None,
-        "speed": speed,
+        "action": WIRE_ACTIONS.get(action, action),
+        "speed": ACTION_SPEEDS.get(action, 0.0),
         "head": head_data,
         "arms": arms_data,
-        "timestamp": time.time()
+        "timestamp": now
     }
 
-def extract_pose_data(tracker) -> Dict[str, Any]:
+def pose_state_key(tracker) -> tuple:
+    """
+    Fingerprint of everything extract_pose_data reads from the tracker: the
+    pose sequence number (new angles on either side) plus actions and rep
+    counts, which can also change on frames with no pose detected
+    """
+    return (
+        tracker.pose_seq,
+        tracker.left_action, tracker.right_action,
+        tracker.left_run_reps, tracker.left_jump_reps, tracker.left_crouch_reps, tracker.left_mountain_climber_reps,
+        tracker.right_run_reps, tracker.right_jump_reps, tracker.right_crouch_reps, tracker.right_mountain_climber_reps,
+    )
+
+def extract_pose_data(tracker, now: Optional[float] = None) -> Dict[str, Any]:
     """Extract pose data from tracker and format for WebSocket - returns data for both players"""
     
-    # Get latest angle data for both sides
-    left_angles = {}
-    right_angles = {}
-    
-    if len(tracker.left_angle_history) > 0:
-        left_angles = tracker.left_angle_history[-1]
-    
-    if len(tracker.right_angle_history) > 0:
-        right_angles = tracker.right_angle_history[-1]
+    # One timestamp for the whole frame, shared by both players
+    if now is None:
+        now = time.time()
     
-    # Get actions for both sides
-    left_action = getattr(tracker, 'left_action', 'unknown')
-    right_action = getattr(tracker, 'right_action', 'unknown')
+    # Get latest angle data for both sides
+    left_history = tracker.left_angle_history
+    right_history = tracker.right_angle_history
+    left_angles = left_history[-1] if left_history else {}
+    right_angles = right_history[-1] if right_history else {}
     
     # Extract data for both players
-    player1_data = extract_player_data(left_angles, left_action, 1)
-    player2_data = extract_player_data(right_angles, right_action, 2)
+    player1_data = extract_player_data(left_angles, tracker.left_action, 1, now)
+    player2_data = extract_player_data(right_angles, tracker.right_action, 2, now)
     
     return {
         "players": [player1_data, player2_data],
-        "timestamp": time.time(),
+        "timestamp": now,
         "debug": {
             "left_reps": {
-                "run": getattr(tracker, 'left_run_reps', 0),
-                "jump": getattr(tracker, 'left_jump_reps', 0),
-                "crouch": getattr(tracker, 'left_crouch_reps', 0),
-                "mountain_climber": getattr(tracker, 'left_mountain_climber_reps', 0)
+                "run": tracker.left_run_reps,
+                "jump": tracker.left_jump_reps,
+                "crouch": tracker.left_crouch_reps,
+                "mountain_climber": tracker.left_mountain_climber_reps
             },
             "right_reps": {
-                "run": getattr(tracker, 'right_run_reps', 0),
-                "jump": getattr(tracker, 'right_jump_reps', 0),
-                "crouch": getattr(tracker, 'right_crouch_reps', 0),
-                "mountain_climber": getattr(tracker, 'right_mountain_climber_reps', 0)
+                "run": tracker.right_run_reps,
+                "jump": tracker.right_jump_reps,
+                "crouch": tracker.right_crouch_reps,
+                "mountain_climber": tracker.right_mountain_climber_reps
             }
         }
     }
 
+class PreviewWindow:
+    """
+    Debug preview of processed frames. A daemon thread owns the HighGUI window, so
+    imshow/waitKey never run on the event loop; show() only hands over the latest frame.
+    """
+    
+    def __init__(self, title: str):
+        self.title = title
+        self.frames: queue.Queue = queue.Queue(maxsize=1)
+        self.closed = threading.Event()  # Set when ESC is pressed or close() is called
+        self.thread = threading.Thread(target=self._run, name="preview", daemon=True)
+        self.thread.start()
+    
+    def show(self, frame):
+        """Queue a frame for display, replacing one that hasn't been shown yet"""
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                pass
+            self.frames.put_nowait(frame)
+    
+    def _run(self):
+        while not self.closed.is_set():
+            try:
+                cv2.imshow(self.title, self.frames.get(timeout=0.1))
+            except queue.Empty:
+                pass
+            
+            # Check for ESC key to exit (non-blocking)
+            if cv2.waitKey(1) & 0xFF == 27:  # ESC key
+                self.closed.set()
+        cv2.destroyAllWindows()  # Close OpenCV windows
+    
+    def close(self):
+        self.closed.set()
+        self.thread.join(timeout=1.0)
+
+def grab_and_process(cap, tracker):
+    """Read, mirror and run pose tracking on one camera frame (blocking); returns None if no frame"""
+    ret, frame = cap.read()
+    if not ret:
+        return None
+    
+    frame = cv2.flip(frame, 1)
+    return tracker.process_frame(frame)
+
+# Latest pose update from the camera loop; maxsize=1 so the
+# broadcaster always gets the newest frame and stale ones are dropped (created on startup)
+pose_queue: Optional[asyncio.Queue] = None
+
+def publish_pose_data(pose_data: Dict):
+    """Offer a pose update to the broadcaster, replacing any update it hasn't taken yet"""
+    try:
+        pose_queue.put_nowait(pose_data)
+    except asyncio.QueueFull:
+        pose_queue.get_nowait()
+        pose_queue.put_nowait(pose_data)
+
 async def camera_loop():
-    """Main camera processing loop"""
+    """Main camera processing loop (producer: capture, track, publish pose updates)"""
     global pose_tracker, manager
     
     print("📹 Starting camera...")
@@ -175,80 +411,132 @@ async def camera_loop():
         print("❌ Could not open camera")
         return
     
+    cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+    
     print("✅ Camera ready")
     
-    # Throttling variables for WebSocket broadcasts
-    frame_counter = 0
-    broadcast_every_n_frames = 30 // WEBSOCKET_BROADCAST_FPS  # Calculate based on config
-    broadcast_fps = 30 // broadcast_every_n_frames
-    print(f"🌐 WebSocket broadcast rate: {broadcast_fps} FPS (reduced from 30 FPS to prevent lag)")
-    print(f"📷 Camera processing: 30 FPS (full rate for smooth detection)")
+    print(f"📷 Camera processing: {CAMERA_FPS} FPS (full rate for smooth detection)")
+    
+    # cap.read() and pose tracking block in C code; run them on a dedicated camera
+    # thread so the event loop keeps servicing WebSocket sends in the meantime
+    loop = asyncio.get_running_loop()
+    camera_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="camera")
+    preview = PreviewWindow('Dual Pose Tracker - WebSocket Server') if DEBUG_DISPLAY else None
+    last_state_key = None
     
     try:
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            # Always process frame for smooth pose detection and display
+            processed_frame = await loop.run_in_executor(camera_executor, grab_and_process, cap, pose_tracker)
+            if processed_frame is None:
                 await asyncio.sleep(0.1)
                 continue
-            
-            frame = cv2.flip(frame, 1)
-            
-            # Always process frame for smooth pose detection and display
-            processed_frame = pose_tracker.process_frame(frame)
+            frame_time = time.time()
             
             # Display the processed frame with pose landmarks
-            cv2.imshow('Dual Pose Tracker - WebSocket Server', processed_frame)
-            
-            # Only broadcast pose data every N frames to reduce network load
-            frame_counter += 1
-            if frame_counter >= broadcast_every_n_frames:
-                if manager.active_connections:  # Only extract/broadcast if there are clients
-                    pose_data = extract_pose_data(pose_tracker)
-                    await manager.broadcast(pose_data)
-                frame_counter = 0  # Reset counter
+            if preview:
+                if preview.closed.is_set():
+                    print("🔑 ESC pressed - stopping camera...")
+                    break
+                preview.show(processed_frame)
             
-            # Check for ESC key to exit (non-blocking)
-            if cv2.waitKey(1) & 0xFF == 27:  # ESC key
-                print("🔑 ESC pressed - stopping camera...")
-                break
+            # Publish only frames that changed what clients see (a new pose or
+            # classification); the tracker is idle here, between camera-thread runs
+            if manager.active_connections:  # Only extract if there are clients
+                state_key = pose_state_key(pose_tracker)
+                if state_key != last_state_key:
+                    publish_pose_data(extract_pose_data(pose_tracker, frame_time))
+                    last_state_key = state_key
             
-            # Control frame rate (30 FPS for smooth pose processing)
-            await asyncio.sleep(1/30)
+            # Yield to the event loop so WebSocket sends can run; the camera thread blocking
+            # on the next frame already paces the loop at the camera's frame rate
+            await asyncio.sleep(0)
             
     except asyncio.CancelledError:
         print("📹 Camera stopped")
     finally:
+        # Let an in-flight read finish before releasing the camera under it
+        camera_executor.shutdown(wait=True)
         cap.release()
-        cv2.destroyAllWindows()  # Close OpenCV windows
+        if preview:
+            preview.close()
         if pose_tracker and hasattr(pose_tracker, 'pose_left'):
             pose_tracker.pose_left.close()
         if pose_tracker and hasattr(pose_tracker, 'pose_right'):
             pose_tracker.pose_right.close()
 
-# Global camera task
+async def broadcast_loop():
+    """Broadcast loop (consumer: send the latest pose update at WEBSOCKET_BROADCAST_FPS)"""
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / WEBSOCKET_BROADCAST_FPS
+    print(f"🌐 WebSocket broadcast rate: {WEBSOCKET_BROADCAST_FPS} FPS (reduced from {CAMERA_FPS} FPS to prevent lag)")
+    
+    next_tick = loop.time()
+    try:
+        while True:
+            try:
+                pose_data = pose_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                # Nothing new (no pose detected, or the same classification) - resend the
+                # previous message, timestamps included, without rebuilding or re-encoding it
+                await manager.broadcast_latest()
+            else:
+                await manager.broadcast(pose_data)
+            
+            # Fixed cadence independent of capture timing (and of how long the send took)
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()  # Fell behind; don't burst to catch up
+                delay = 0
+            await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        print("🌐 Broadcast stopped")
+
+# Global background tasks
 camera_task = None
+broadcast_task = None
+prune_task = None
 
 @app.on_event("startup")
 async def startup():
-    global camera_task
+    global camera_task, broadcast_task, prune_task, pose_queue
     print("🚀 Starting pose tracker server...")
+    pose_queue = asyncio.Queue(maxsize=1)
     camera_task = asyncio.create_task(camera_loop())
+    broadcast_task = asyncio.create_task(broadcast_loop())
+    prune_task = asyncio.create_task(prune_limiter_loop())
 
 @app.on_event("shutdown")
 async def shutdown():
-    global camera_task
-    if camera_task:
-        camera_task.cancel()
-        try:
-            await camera_task
-        except asyncio.CancelledError:
-            pass
+    for task in (camera_task, broadcast_task, prune_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
 @app.websocket("/ws/pose")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, wire_format: str = Query("json", alias="format")):
     client_ip = websocket.client.host if websocket.client else "unknown"
-    print(f"🔌 Client connected from {client_ip}. Total connections: {len(manager.active_connections)}")
+    
+    # Refuse before accepting: 1008 (policy violation) for abusive clients or a full server
+    if not connect_limiter.allow(client_ip):
+        print(f"⛔ Rejected connection from {client_ip}: rate limit exceeded")
+        await websocket.close(code=1008)
+        return
+    if len(manager.active_connections) >= MAX_CLIENTS:
+        print(f"⛔ Rejected connection from {client_ip}: {MAX_CLIENTS} clients already connected")
+        await websocket.close(code=1008)
+        return
+    
+    if wire_format not in WIRE_FORMATS:
+        await websocket.close(code=1003, reason=f"Unsupported format '{wire_format}', expected one of {WIRE_FORMATS}")
+        return
+    
+    await manager.connect(websocket, wire_format)
+    print(f"🔌 Client connected from {client_ip} ({wire_format}). Total connections: {len(manager.active_connections)}")
     
     try:
         while True:
@@ -301,8 +589,14 @@ if __name__ == "__main__":
     print("🚀 Starting Pose Tracker WebSocket Server...")
     uvicorn.run(
         "pose_websocket_server:app",
-        host="0.0.0.0",
-        port=8000,
+        host=SERVER_HOST,
+        port=SERVER_PORT,
         reload=False,
-        log_level="info"
+        log_level="info",
+        proxy_headers=True,  # trust X-Forwarded-* from the local reverse proxy for client IPs
+        # Frames are a few hundred bytes of JSON or compact MessagePack; permessage-deflate
+        # would save little on them (its framing/dictionary overhead eats most of the gain
+        # below ~200 bytes) while costing a zlib pass per client per message
+        ws_per_message_deflate=False,
+        loop="auto"  # uvloop when installed (see requirements.txt), stock asyncio otherwise
     ) 
\ No newline at end of file
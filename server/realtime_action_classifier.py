@@ -1,8 +1,208 @@
 import math
 import numpy as np
-from collections import deque
+from dataclasses import asdict, astuple, dataclass, fields
+from itertools import chain
+from operator import attrgetter, itemgetter
 from typing import List, Optional, Tuple, Dict
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional - analyze_temporal_patterns falls back to NumPy
+    njit = None
+
+# Reads (x, y, visibility) off a landmark in a single C-level call
+_landmark_fields = attrgetter('x', 'y', 'visibility')
+
+# Landmarks below this visibility are treated as missing
+MIN_VISIBILITY = 0.3
+
+# The only landmarks the temporal features read, in ring buffer order
+FEATURE_LANDMARKS = (
+    'left_shoulder', 'right_shoulder', 'left_hip', 'right_hip',
+    'left_knee', 'right_knee', 'left_ankle', 'right_ankle',
+)
+L_SHOULDER, R_SHOULDER, L_HIP, R_HIP, L_KNEE, R_KNEE, L_ANKLE, R_ANKLE = range(len(FEATURE_LANDMARKS))
+
+# Left/right slot pairs, precomputed for fancy indexing in the NumPy path
+IDX_HIPS = np.array([L_HIP, R_HIP])
+IDX_KNEES = np.array([L_KNEE, R_KNEE])
+IDX_ANKLES = np.array([L_ANKLE, R_ANKLE])
+IDX_LEFT_HEIGHTS = np.array([L_HIP, L_ANKLE])
+IDX_RIGHT_HEIGHTS = np.array([R_HIP, R_ANKLE])
+
+# Stand-in (x, y, visibility) for a landmark the pose model did not return
+MISSING_LANDMARK = (math.nan, math.nan, math.nan)
+
+# Image y grows downward, so "up" is -y
+VERTICAL = np.array([0.0, -1.0])
+
+# Values derived from each frame as it arrives, in ring buffer column order
+FRAME_VALUES = ('left_knee_angle', 'right_knee_angle', 'hip_height', 'ankle_height', 'torso_angle')
+LEFT_KNEE_ANGLE, RIGHT_KNEE_ANGLE, HIP_HEIGHT, ANKLE_HEIGHT, TORSO_ANGLE = range(len(FRAME_VALUES))
+ANGLE_COLUMNS = np.array([LEFT_KNEE_ANGLE, RIGHT_KNEE_ANGLE, TORSO_ANGLE])
+
+@dataclass
+class Features:
+    """
+    Temporal features over the pose buffer.
+    
+    Features that could not be computed (e.g. knees never tracked) are NaN,
+    which fails every threshold comparison in classify_action.
+    """
+    avg_knee_angle: float = math.nan
+    knee_angle_std: float = math.nan
+    leg_alternation: int = 0
+    avg_hip_height: float = math.nan
+    hip_height_std: float = math.nan
+    hip_range: float = math.nan
+    avg_ankle_height: float = math.nan
+    ankle_height_std: float = math.nan
+    ankle_range: float = math.nan
+    avg_torso_angle: float = math.nan
+    torso_angle_std: float = math.nan
+
+# Fixed layout of the feature vector written by the temporal feature kernel
+FEATURE_NAMES = tuple(field.name for field in fields(Features))
+AVG_KNEE_ANGLE = FEATURE_NAMES.index('avg_knee_angle')
+KNEE_ANGLE_STD = FEATURE_NAMES.index('knee_angle_std')
+LEG_ALTERNATION = FEATURE_NAMES.index('leg_alternation')
+AVG_HIP_HEIGHT = FEATURE_NAMES.index('avg_hip_height')
+HIP_HEIGHT_STD = FEATURE_NAMES.index('hip_height_std')
+HIP_RANGE = FEATURE_NAMES.index('hip_range')
+AVG_ANKLE_HEIGHT = FEATURE_NAMES.index('avg_ankle_height')
+ANKLE_HEIGHT_STD = FEATURE_NAMES.index('ankle_height_std')
+ANKLE_RANGE = FEATURE_NAMES.index('ankle_range')
+AVG_TORSO_ANGLE = FEATURE_NAMES.index('avg_torso_angle')
+TORSO_ANGLE_STD = FEATURE_NAMES.index('torso_angle_std')
+
+def _vector_angles(ba: np.ndarray, bc: np.ndarray, out: np.ndarray, norms: np.ndarray):
+    """
+    Angle in degrees between matching rows of (N, 2) vectors, written to out.
+    NaN wherever either vector involves a missing landmark or has zero length.
+    norms is (2, N) scratch.
+    """
+    np.einsum('ij,ij->i', ba, bc, out=out)
+    np.einsum('ij,ij->i', ba, ba, out=norms[0])
+    np.einsum('ij,ij->i', bc, bc, out=norms[1])
+    
+    # |BA| * |BC| == sqrt(|BA|^2 * |BC|^2) - one sqrt instead of two
+    np.multiply(norms[0], norms[1], out=norms[0])
+    np.sqrt(norms[0], out=norms[0])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.divide(out, norms[0], out=out)
+    np.clip(out, -1.0, 1.0, out=out)
+    np.arccos(out, out=out)
+    np.degrees(out, out=out)
+
+
+def _pair_mean(left: np.ndarray, right: np.ndarray, out: np.ndarray, missing: np.ndarray):
+    """
+    Mean of left/right values into out, falling back to whichever side is
+    present (NaN if neither). Overwrites left; missing is boolean scratch.
+    """
+    np.add(left, right, out=out)
+    out /= 2
+    np.isnan(out, out=missing)
+    np.copyto(out, np.fmax(left, right, out=left), where=missing)
+
+
+def _kernel_angle(ax, ay, bx, by, cx, cy):
+    """Angle at b in degrees, NaN for a missing landmark or a zero-length vector"""
+    # Accumulate in float64 - acos is ill-conditioned near a straight limb
+    bax = np.float64(ax) - bx
+    bay = np.float64(ay) - by
+    bcx = np.float64(cx) - bx
+    bcy = np.float64(cy) - by
+    magnitude = math.sqrt((bax * bax + bay * bay) * (bcx * bcx + bcy * bcy))
+    if not magnitude > 0.0:
+        return np.nan
+    cosine_angle = (bax * bcx + bay * bcy) / magnitude
+    if cosine_angle > 1.0:
+        cosine_angle = 1.0
+    elif cosine_angle < -1.0:
+        cosine_angle = -1.0
+    return math.degrees(math.acos(cosine_angle))
+
+
+def _kernel_pair_mean(left, right):
+    """Mean of left/right, falling back to whichever side is present"""
+    if math.isnan(left):
+        return right
+    if math.isnan(right):
+        return left
+    return (left + right) / 2
+
+
+def _frame_values_kernel(frame, out):
+    """
+    Per-frame values of one (8, 3) frame of FEATURE_LANDMARKS, laid out as FRAME_VALUES.
+    Values whose landmarks are missing are NaN.
+    """
+    out[LEFT_KNEE_ANGLE] = _kernel_angle(frame[L_HIP, 0], frame[L_HIP, 1], frame[L_KNEE, 0], frame[L_KNEE, 1],
+                                         frame[L_ANKLE, 0], frame[L_ANKLE, 1])
+    out[RIGHT_KNEE_ANGLE] = _kernel_angle(frame[R_HIP, 0], frame[R_HIP, 1], frame[R_KNEE, 0], frame[R_KNEE, 1],
+                                          frame[R_ANKLE, 0], frame[R_ANKLE, 1])
+    out[HIP_HEIGHT] = _kernel_pair_mean(np.float64(frame[L_HIP, 1]), np.float64(frame[R_HIP, 1]))
+    out[ANKLE_HEIGHT] = _kernel_pair_mean(np.float64(frame[L_ANKLE, 1]), np.float64(frame[R_ANKLE, 1]))
+    
+    # Torso: shoulder midpoint -> hip midpoint -> point straight above the hips
+    hip_x = (np.float64(frame[L_HIP, 0]) + frame[R_HIP, 0]) / 2
+    hip_y = (np.float64(frame[L_HIP, 1]) + frame[R_HIP, 1]) / 2
+    out[TORSO_ANGLE] = _kernel_angle((np.float64(frame[L_SHOULDER, 0]) + frame[R_SHOULDER, 0]) / 2,
+                                     (np.float64(frame[L_SHOULDER, 1]) + frame[R_SHOULDER, 1]) / 2,
+                                     hip_x, hip_y, hip_x, hip_y - 1.0)
+
+
+def _temporal_features_kernel(values, out):
+    """
+    Temporal features over a (T, 5) window of per-frame values, oldest first.
+    out is laid out as FEATURE_NAMES, with the same defaults as Features.
+    """
+    count = values.shape[0]
+    out[:] = np.nan
+    out[LEG_ALTERNATION] = 0
+    
+    knees = values[:, LEFT_KNEE_ANGLE:RIGHT_KNEE_ANGLE + 1]
+    if not (np.isnan(knees[:, 0]).all() or np.isnan(knees[:, 1]).all()):
+        out[AVG_KNEE_ANGLE] = np.nanmean(knees)
+        out[KNEE_ANGLE_STD] = np.nanstd(knees)
+        
+        # Leg alternation across the frames where both knees were tracked
+        crossovers = 0
+        previous = np.nan
+        for t in range(count):
+            diff = knees[t, 0] - knees[t, 1]
+            if math.isnan(diff):
+                continue
+            if previous * diff < 0:
+                crossovers += 1
+            previous = diff
+        out[LEG_ALTERNATION] = crossovers
+    
+    for column, avg, std, span in ((HIP_HEIGHT, AVG_HIP_HEIGHT, HIP_HEIGHT_STD, HIP_RANGE),
+                                   (ANKLE_HEIGHT, AVG_ANKLE_HEIGHT, ANKLE_HEIGHT_STD, ANKLE_RANGE)):
+        heights = values[:, column]
+        if not np.isnan(heights).all():
+            out[avg] = np.nanmean(heights)
+            out[std] = np.nanstd(heights)
+            out[span] = np.nanmax(heights) - np.nanmin(heights)
+    
+    torso = values[:, TORSO_ANGLE]
+    if not np.isnan(torso).all():
+        out[AVG_TORSO_ANGLE] = np.nanmean(torso)
+        out[TORSO_ANGLE_STD] = np.nanstd(torso)
+
+if njit is not None:
+    # nogil: the kernels touch no Python objects, so capture/inference threads keep running
+    _kernel_angle = njit(cache=True, nogil=True)(_kernel_angle)
+    _kernel_pair_mean = njit(cache=True, nogil=True)(_kernel_pair_mean)
+    _frame_values = njit(cache=True, nogil=True)(_frame_values_kernel)
+    _temporal_features = njit(cache=True, nogil=True)(_temporal_features_kernel)
+else:
+    _frame_values = None
+    _temporal_features = None
+
+
 class ActionClassifier:
     """
     Real-time action classifier using MediaPipe pose landmarks.
@@ -19,7 +219,39 @@ class ActionClassifier:
             buffer_size: Number of frames to keep in history buffer (reduced for faster response)
         """
         self.buffer_size = buffer_size
-        self.pose_buffer = deque(maxlen=buffer_size)
+        
+        # FEATURE_LANDMARKS (x, y, visibility) of the incoming frame; x/y are NaN
+        # for landmarks that are missing or below MIN_VISIBILITY
+        self.frame = np.full((len(FEATURE_LANDMARKS), 3), np.nan, dtype=np.float32)
+        
+        # Ring buffer of FRAME_VALUES, computed once per frame as it arrives so
+        # older frames are never re-derived. Every frame is written twice,
+        # buffer_size rows apart, so the buffered frames are always one
+        # contiguous oldest-first slice (see _window)
+        self.values = np.full((2 * buffer_size, len(FRAME_VALUES)), np.nan)
+        self.head = 0   # row the next frame is written to
+        self.count = 0  # number of buffered frames
+        
+        # Scratch for the NumPy fallback, reused every frame so the steady
+        # state allocates nothing. Rows of _ba/_bc are left knee, right knee, torso
+        self._xy = np.empty((len(FEATURE_LANDMARKS), 2))
+        self._knees = np.empty((2, 2))
+        self._ba = np.empty((len(ANGLE_COLUMNS), 2))
+        self._bc = np.empty((len(ANGLE_COLUMNS), 2))
+        self._bc[2] = VERTICAL
+        self._angles = np.empty(len(ANGLE_COLUMNS))
+        self._norms = np.empty((2, len(ANGLE_COLUMNS)))
+        self._left_heights = np.empty(2)
+        self._right_heights = np.empty(2)
+        self._missing = np.empty(2, dtype=bool)
+        
+        # Output of the numba feature kernel
+        self._features = np.array(astuple(Features()), dtype=np.float64)
+        if _temporal_features is not None:
+            # Compile (or load from cache) now rather than on the first real frame
+            _frame_values(self.frame, self.values[0])
+            _temporal_features(self._window(), self._features)
+        
         self.current_action = "none"
         
         # MediaPipe pose landmark indices
@@ -41,6 +273,13 @@ class ActionClassifier:
             'left_heel': 29, 'right_heel': 30,
             'left_foot_index': 31, 'right_foot_index': 32
         }
+        
+        # Pose landmark index of each FEATURE_LANDMARKS slot, resolved once so the
+        # per-frame path does no name lookups
+        self._needed = [self.landmarks[name] for name in FEATURE_LANDMARKS]
+        self._get_needed = itemgetter(*self._needed)
+        self._needed_index = np.array(self._needed)
+        self._min_landmarks = max(self._needed) + 1
     
     def get_joint_angle(self, point_a: Tuple[float, float], 
                        point_b: Tuple[float, float], 
@@ -56,31 +295,26 @@ class ActionClassifier:
         Returns:
             Angle in degrees, or None if calculation fails
         """
-        try:
-            # Convert to numpy arrays for vector calculations
-            a = np.array(point_a)
-            b = np.array(point_b)
-            c = np.array(point_c)
-            
-            # Create vectors BA and BC
-            ba = a - b
-            bc = c - b
-            
-            # Calculate cosine of angle using dot product
-            cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-            
-            # Clamp to valid range to avoid numerical errors
-            cosine_angle = np.clip(cosine_angle, -1.0, 1.0)
-            
-            # Convert to degrees
-            angle = math.degrees(math.acos(cosine_angle))
-            
-            return angle
-            
-        except (ValueError, ZeroDivisionError):
+        # Plain float math - three tiny numpy arrays per call cost more than the angle itself
+        ax, ay = point_a
+        bx, by = point_b
+        cx, cy = point_c
+        
+        # Create vectors BA and BC
+        bax, bay = ax - bx, ay - by
+        bcx, bcy = cx - bx, cy - by
+        
+        magnitude = math.sqrt((bax * bax + bay * bay) * (bcx * bcx + bcy * bcy))
+        if not magnitude > 0.0:  # zero-length vector or a NaN (missing) point
             return None
+        
+        # Clamp to valid range to avoid numerical errors
+        cosine_angle = max(-1.0, min(1.0, (bax * bcx + bay * bcy) / magnitude))
+        
+        # Convert to degrees
+        return math.degrees(math.acos(cosine_angle))
     
-    def extract_landmark_coords(self, landmarks, landmark_name: str) -> Optional[Tuple[float, float]]:
+    def extract_landmark_coords(self, landmarks, landmark_name: str) -> Tuple[float, float]:
         """
         Extract x, y coordinates from a landmark.
         
@@ -89,28 +323,21 @@ class ActionClassifier:
             landmark_name: Name of the landmark to extract
             
         Returns:
-            (x, y) coordinates or None if landmark is missing/invalid
-        """
-        try:
-            if landmark_name not in self.landmarks:
-                return None
-                
-            idx = self.landmarks[landmark_name]
-            if idx >= len(landmarks.landmark):
-                return None
-                
-            landmark = landmarks.landmark[idx]
-            
-            # Check if landmark has reasonable visibility
-            if hasattr(landmark, 'visibility') and landmark.visibility < 0.3:
-                return None
-                
+            (x, y) coordinates, or (NaN, NaN) if landmark is missing/invalid so
+            callers can do plain arithmetic and let NaN propagate
+        """
+        idx = self.landmarks.get(landmark_name, len(landmarks.landmark))
+        if idx >= len(landmarks.landmark):
+            return MISSING_LANDMARK[:2]
+        
+        landmark = landmarks.landmark[idx]
+        
+        # Low-visibility landmarks read as NaN rather than None
+        if getattr(landmark, 'visibility', 1.0) >= MIN_VISIBILITY:
             return (landmark.x, landmark.y)
-            
-        except (AttributeError, IndexError):
-            return None
+        return MISSING_LANDMARK[:2]
     
-    def get_knee_angle(self, landmarks, side: str) -> Optional[float]:
+    def get_knee_angle(self, landmarks, side: str) -> float:
         """
         Calculate knee angle (hip -> knee -> ankle).
         
@@ -119,18 +346,14 @@ class ActionClassifier:
             side: "left" or "right"
             
         Returns:
-            Knee angle in degrees or None if calculation fails
+            Knee angle in degrees, NaN if any of the three landmarks is missing
         """
         hip = self.extract_landmark_coords(landmarks, f'{side}_hip')
         knee = self.extract_landmark_coords(landmarks, f'{side}_knee')
         ankle = self.extract_landmark_coords(landmarks, f'{side}_ankle')
-        
-        if hip is None or knee is None or ankle is None:
-            return None
-            
-        return self.get_joint_angle(hip, knee, ankle)
+        return _kernel_angle(*hip, *knee, *ankle)
     
-    def get_hip_height(self, landmarks) -> Optional[float]:
+    def get_hip_height(self, landmarks) -> float:
         """
         Get average hip height (y-coordinate).
         
@@ -138,23 +361,13 @@ class ActionClassifier:
             landmarks: MediaPipe pose landmarks
             
         Returns:
-            Average hip y-coordinate or None if hips not detected
+            Average hip y-coordinate (a single visible hip is used as is), NaN if hips not detected
         """
         left_hip = self.extract_landmark_coords(landmarks, 'left_hip')
         right_hip = self.extract_landmark_coords(landmarks, 'right_hip')
-        
-        if left_hip is None and right_hip is None:
-            return None
-        elif left_hip is None and right_hip is not None:
-            return right_hip[1]
-        elif right_hip is None and left_hip is not None:
-            return left_hip[1]
-        elif left_hip is not None and right_hip is not None:
-            return (left_hip[1] + right_hip[1]) / 2
-        else:
-            return None
+        return _kernel_pair_mean(left_hip[1], right_hip[1])
     
-    def get_ankle_height(self, landmarks) -> Optional[float]:
+    def get_ankle_height(self, landmarks) -> float:
         """
         Get average ankle height (y-coordinate).
         
@@ -162,23 +375,13 @@ class ActionClassifier:
             landmarks: MediaPipe pose landmarks
             
         Returns:
-            Average ankle y-coordinate or None if ankles not detected
+            Average ankle y-coordinate (a single visible ankle is used as is), NaN if ankles not detected
         """
         left_ankle = self.extract_landmark_coords(landmarks, 'left_ankle')
         right_ankle = self.extract_landmark_coords(landmarks, 'right_ankle')
-        
-        if left_ankle is None and right_ankle is None:
-            return None
-        elif left_ankle is None and right_ankle is not None:
-            return right_ankle[1]
-        elif right_ankle is None and left_ankle is not None:
-            return left_ankle[1]
-        elif left_ankle is not None and right_ankle is not None:
-            return (left_ankle[1] + right_ankle[1]) / 2
-        else:
-            return None
+        return _kernel_pair_mean(left_ankle[1], right_ankle[1])
     
-    def get_torso_angle(self, landmarks) -> Optional[float]:
+    def get_torso_angle(self, landmarks) -> float:
         """
         Calculate torso angle (shoulder -> hip -> vertical).
         
@@ -186,149 +389,213 @@ class ActionClassifier:
             landmarks: MediaPipe pose landmarks
             
         Returns:
-            Torso angle in degrees or None if calculation fails
+            Torso angle in degrees, NaN unless both shoulders and both hips are visible
         """
-        # Use average shoulder and hip positions
+        # Use average shoulder and hip positions; a missing landmark makes them NaN
         left_shoulder = self.extract_landmark_coords(landmarks, 'left_shoulder')
         right_shoulder = self.extract_landmark_coords(landmarks, 'right_shoulder')
         left_hip = self.extract_landmark_coords(landmarks, 'left_hip')
         right_hip = self.extract_landmark_coords(landmarks, 'right_hip')
         
-        if not all([left_shoulder, right_shoulder, left_hip, right_hip]):
-            return None
+        hip_x = (left_hip[0] + right_hip[0]) / 2
+        hip_y = (left_hip[1] + right_hip[1]) / 2
+        
+        # Vertical reference point above the hips
+        return _kernel_angle((left_shoulder[0] + right_shoulder[0]) / 2,
+                             (left_shoulder[1] + right_shoulder[1]) / 2,
+                             hip_x, hip_y, hip_x, hip_y - 0.1)
+    
+    def _extract_needed(self, landmarks, out: np.ndarray):
+        """
+        Read the FEATURE_LANDMARKS of one frame into out, in a single pass.
+        
+        Args:
+            landmarks: MediaPipe pose landmarks, or a (33, 3) array of (x, y, visibility)
+            out: (8, 3) array to fill with (x, y, visibility)
+        """
+        if isinstance(landmarks, np.ndarray):
+            # Already in array form - gather the slots directly
+            present = self._needed_index < len(landmarks)
+            out[~present] = MISSING_LANDMARK
+            out[present] = landmarks[self._needed_index[present], :3]
+            return
+        
+        points = landmarks.landmark
+        available = len(points)
+        if available >= self._min_landmarks:
+            # Fetch all eight landmarks in one call and stream their fields
+            # straight into the frame - no per-landmark tuples built in Python
+            needed = self._get_needed(points)
+            try:
+                fields_iter = chain.from_iterable(map(_landmark_fields, needed))
+                out.reshape(-1)[:] = np.fromiter(fields_iter, dtype=np.float32, count=out.size)
+            except AttributeError:
+                # Landmarks without a visibility field count as visible, as in extract_landmark_coords
+                out[:] = [(lm.x, lm.y, getattr(lm, 'visibility', 1.0)) for lm in needed]
+        else:
+            out[:] = [(points[idx].x, points[idx].y, getattr(points[idx], 'visibility', 1.0))
+                      if idx < available else MISSING_LANDMARK
+                      for idx in self._needed]
+    
+    def _compute_frame_values(self, out: np.ndarray):
+        """
+        NumPy fallback for _frame_values: FRAME_VALUES of self.frame.
         
-        # Calculate average positions - all values are guaranteed not None from the check above
-        assert left_shoulder is not None and right_shoulder is not None
-        assert left_hip is not None and right_hip is not None
+        Args:
+            out: Array of len(FRAME_VALUES) to fill
+        """
+        # float64 keeps arccos accurate near 180
+        xy = self._xy
+        np.copyto(xy, self.frame[:, :2])
+        ba, bc = self._ba, self._bc
+        
+        # Knee vectors (knee -> hip, knee -> ankle) for both sides at once
+        knees = np.take(xy, IDX_KNEES, axis=0, out=self._knees)
+        np.subtract(np.take(xy, IDX_HIPS, axis=0, out=ba[:2]), knees, out=ba[:2])
+        np.subtract(np.take(xy, IDX_ANKLES, axis=0, out=bc[:2]), knees, out=bc[:2])
+        
+        # Torso vector (hip midpoint -> shoulder midpoint); bc[2] is always vertical
+        np.add(xy[L_SHOULDER], xy[R_SHOULDER], out=ba[2])
+        ba[2] -= xy[L_HIP]
+        ba[2] -= xy[R_HIP]
+        ba[2] /= 2
+        
+        _vector_angles(ba, bc, self._angles, self._norms)
+        out[ANGLE_COLUMNS] = self._angles
+        
+        # Heights
+        np.take(xy[:, 1], IDX_LEFT_HEIGHTS, out=self._left_heights)
+        np.take(xy[:, 1], IDX_RIGHT_HEIGHTS, out=self._right_heights)
+        _pair_mean(self._left_heights, self._right_heights, out[HIP_HEIGHT:ANKLE_HEIGHT + 1], self._missing)
+    
+    def _push_frame(self, landmarks):
+        """
+        Derive one frame's FRAME_VALUES into the ring buffer, overwriting the oldest frame.
         
-        avg_shoulder = ((left_shoulder[0] + right_shoulder[0]) / 2, 
-                       (left_shoulder[1] + right_shoulder[1]) / 2)
-        avg_hip = ((left_hip[0] + right_hip[0]) / 2, 
-                  (left_hip[1] + right_hip[1]) / 2)
+        Args:
+            landmarks: MediaPipe pose landmarks, or a (33, 3) array of (x, y, visibility)
+        """
+        frame = self.frame
+        self._extract_needed(landmarks, frame)
+        
+        # Hide unreliable landmarks (low visibility or non-finite values) so
+        # every downstream reduction skips them - one vectorized test per frame
+        reliable = np.isfinite(frame).all(axis=1) & (frame[:, 2] >= MIN_VISIBILITY)
+        frame[~reliable, :2] = np.nan
         
-        # Create vertical reference point
-        vertical_point = (avg_hip[0], avg_hip[1] - 0.1)  # Point above hip
+        row = self.values[self.head]
+        if _frame_values is not None:
+            _frame_values(frame, row)
+        else:
+            self._compute_frame_values(row)
+        self.values[self.head + self.buffer_size] = row
         
-        return self.get_joint_angle(avg_shoulder, avg_hip, vertical_point)
+        self.head = (self.head + 1) % self.buffer_size
+        self.count = min(self.count + 1, self.buffer_size)
+    
+    def _window(self) -> np.ndarray:
+        """Buffered FRAME_VALUES oldest-first, as a view into the ring buffer"""
+        end = self.head + self.buffer_size
+        return self.values[end - self.count:end]
     
-    def analyze_temporal_patterns(self) -> Dict[str, float]:
+    def analyze_temporal_patterns(self) -> Optional[Features]:
         """
         Analyze patterns across the pose buffer.
         
         Returns:
-            Dictionary of temporal features for classification
-        """
-        if len(self.pose_buffer) < 3:
-            return {}
-        
-        features = {}
-        
-        # Extract temporal data
-        left_knee_angles = []
-        right_knee_angles = []
-        hip_heights = []
-        ankle_heights = []
-        torso_angles = []
-        
-        for landmarks in self.pose_buffer:
-            # Knee angles
-            left_knee = self.get_knee_angle(landmarks, 'left')
-            right_knee = self.get_knee_angle(landmarks, 'right')
-            if left_knee is not None:
-                left_knee_angles.append(left_knee)
-            if right_knee is not None:
-                right_knee_angles.append(right_knee)
-            
-            # Heights
-            hip_height = self.get_hip_height(landmarks)
-            ankle_height = self.get_ankle_height(landmarks)
-            if hip_height is not None:
-                hip_heights.append(hip_height)
-            if ankle_height is not None:
-                ankle_heights.append(ankle_height)
-            
-            # Torso angle
-            torso_angle = self.get_torso_angle(landmarks)
-            if torso_angle is not None:
-                torso_angles.append(torso_angle)
+            Temporal features for classification, or None with fewer than 3 buffered frames
+        """
+        if self.count < 3:
+            return None
+        
+        if _temporal_features is not None:
+            _temporal_features(self._window(), self._features)
+            values = self._features.tolist()
+            values[LEG_ALTERNATION] = int(values[LEG_ALTERNATION])
+            return Features(*values)
+        
+        features = Features()
+        
+        values = self._window()
+        
+        # One NaN test for the whole window; each feature then reduces a
+        # compacted ndarray of its tracked values with plain mean/std
+        tracked = ~np.isnan(values)
+        knee_angles = values[:, LEFT_KNEE_ANGLE:RIGHT_KNEE_ANGLE + 1]
+        knees_tracked = tracked[:, LEFT_KNEE_ANGLE:RIGHT_KNEE_ANGLE + 1]
         
         # Calculate features
-        if left_knee_angles and right_knee_angles:
-            all_knee_angles = left_knee_angles + right_knee_angles
-            features['avg_knee_angle'] = np.mean(all_knee_angles)
-            features['knee_angle_std'] = np.std(all_knee_angles)
+        if knees_tracked.any(axis=0).all():
+            tracked_knee_angles = knee_angles[knees_tracked]
+            features.avg_knee_angle = tracked_knee_angles.mean()
+            features.knee_angle_std = tracked_knee_angles.std()
+            
+            # Leg alternation: count how often left vs right knee angles cross
+            # over, across the frames where both knees were tracked
+            both = knee_angles[knees_tracked.all(axis=1)]
+            signs = np.sign(both[:, 0] - both[:, 1])
             
-            # Leg alternation detection (reduced requirement for faster response)
-            if len(left_knee_angles) >= 2 and len(right_knee_angles) >= 2:
-                # Count how often left vs right knee angles cross over
-                min_len = min(len(left_knee_angles), len(right_knee_angles))
-                left_subset = left_knee_angles[:min_len]
-                right_subset = right_knee_angles[:min_len]
-                
-                crossovers = 0
-                for i in range(1, min_len):
-                    if ((left_subset[i-1] - right_subset[i-1]) * 
-                        (left_subset[i] - right_subset[i]) < 0):
-                        crossovers += 1
-                
-                features['leg_alternation'] = crossovers
-            else:
-                features['leg_alternation'] = 0
-        
-        if hip_heights:
-            features['avg_hip_height'] = np.mean(hip_heights)
-            features['hip_height_std'] = np.std(hip_heights)
-            features['hip_range'] = max(hip_heights) - min(hip_heights)
-        
-        if ankle_heights:
-            features['avg_ankle_height'] = np.mean(ankle_heights)
-            features['ankle_height_std'] = np.std(ankle_heights)
-            features['ankle_range'] = max(ankle_heights) - min(ankle_heights)
-        
-        if torso_angles:
-            features['avg_torso_angle'] = np.mean(torso_angles)
-            features['torso_angle_std'] = np.std(torso_angles)
+            # Consecutive frames with opposite signs cross over; a zero difference never counts
+            features.leg_alternation = int(np.count_nonzero(signs[1:] * signs[:-1] < 0))
+        
+        # Range is one np.ptp pass instead of max then min
+        hip_heights = values[tracked[:, HIP_HEIGHT], HIP_HEIGHT]
+        if hip_heights.size:
+            features.avg_hip_height = hip_heights.mean()
+            features.hip_height_std = hip_heights.std()
+            features.hip_range = np.ptp(hip_heights)
+        
+        ankle_heights = values[tracked[:, ANKLE_HEIGHT], ANKLE_HEIGHT]
+        if ankle_heights.size:
+            features.avg_ankle_height = ankle_heights.mean()
+            features.ankle_height_std = ankle_heights.std()
+            features.ankle_range = np.ptp(ankle_heights)
+        
+        torso_angles = values[tracked[:, TORSO_ANGLE], TORSO_ANGLE]
+        if torso_angles.size:
+            features.avg_torso_angle = torso_angles.mean()
+            features.torso_angle_std = torso_angles.std()
         
         return features
     
-    def classify_action(self, features: Dict[str, float]) -> str:
+    def classify_action(self, features: Optional[Features]) -> str:
         """
         Classify action based on temporal features.
         
         Args:
-            features: Dictionary of extracted temporal features
+            features: Extracted temporal features (None when the buffer is too short)
             
         Returns:
             Classified action: "jump", "run", "crouch", "mountain_climber", or "none"
         """
-        if not features:
+        if features is None:
             return "none"
         
         # === CROUCH DETECTION ===
         # Low knee angles, stable position (more sensitive)
-        if (features.get('avg_knee_angle', 180) < 110 and
-            features.get('knee_angle_std', 0) < 20):
+        if (features.avg_knee_angle < 110 and
+            features.knee_angle_std < 20):
             return "crouch"
         
         # === JUMP DETECTION ===
         # Extended knees, ankle movement indicating feet leaving ground (much more sensitive)
-        if (features.get('avg_knee_angle', 0) > 130 and  # Reduced from 140 to 130
-            features.get('ankle_range', 0) > 0.01 and   # Reduced from 0.02 to 0.01 (50% more sensitive)
-            features.get('leg_alternation', 0) < 2):     # Legs move together
+        if (features.avg_knee_angle > 130 and   # Reduced from 140 to 130
+            features.ankle_range > 0.01 and     # Reduced from 0.02 to 0.01 (50% more sensitive)
+            features.leg_alternation < 2):      # Legs move together
             return "jump"
         
         # === MOUNTAIN CLIMBER DETECTION ===
         # Low torso angle, leg alternation, variable knee angles (more sensitive)
-        if (features.get('avg_torso_angle', 90) < 60 and
-            features.get('leg_alternation', 0) > 1 and
-            features.get('knee_angle_std', 0) > 15):
+        if (features.avg_torso_angle < 60 and
+            features.leg_alternation > 1 and
+            features.knee_angle_std > 15):
             return "mountain_climber"
         
         # === RUN DETECTION ===
         # Leg alternation, knee movement, hip oscillation (original sensitivity)
-        if (features.get('leg_alternation', 0) > 1 and
-            features.get('knee_angle_std', 0) > 10 and
-            features.get('hip_range', 0) > 0.01):
+        if (features.leg_alternation > 1 and
+            features.knee_angle_std > 10 and
+            features.hip_range > 0.01):
             return "run"
         
         # === DEFAULT ===
@@ -339,7 +606,8 @@ class ActionClassifier:
         Process a single frame of pose landmarks.
         
         Args:
-            landmarks: MediaPipe pose landmarks for current frame
+            landmarks: MediaPipe pose landmarks for current frame, or a (33, 3)
+                array of (x, y, visibility) in MediaPipe landmark order
             
         Returns:
             Classified action for current frame
@@ -348,7 +616,12 @@ class ActionClassifier:
             return "none"
         
         # Add current frame to buffer
-        self.pose_buffer.append(landmarks)
+        self._push_frame(landmarks)
+        
+        # Too few frames to classify - skip the analysis entirely
+        if self.count < 3:
+            self.current_action = "none"
+            return self.current_action
         
         # Analyze temporal patterns
         features = self.analyze_temporal_patterns()
@@ -371,7 +644,9 @@ class ActionClassifier:
         """
         Reset the classifier state.
         """
-        self.pose_buffer.clear()
+        self.values.fill(np.nan)
+        self.head = 0
+        self.count = 0
         self.current_action = "none"
     
     def get_debug_info(self) -> Dict:
@@ -383,12 +658,16 @@ class ActionClassifier:
         """
         features = self.analyze_temporal_patterns()
         return {
-            'buffer_size': len(self.pose_buffer),
+            'buffer_size': self.count,
             'current_action': self.current_action,
-            'features': features
+            'features': asdict(features) if features is not None else {}
         }
 
 
+# Name matching this module; there is a single implementation
+RealtimeActionClassifier = ActionClassifier
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Example usage
@@ -403,6 +682,13 @@ if __name__ == "__main__":
     # action = classifier.process_frame(pose_landmarks)
     # print(f"Detected action: {action}")
     
+    # Frames can also be passed as (33, 3) arrays of (x, y, visibility)
+    rng = np.random.default_rng(0)
+    for _ in range(classifier.buffer_size):
+        frame = np.column_stack([rng.random((33, 2)), np.ones(33)]).astype(np.float32)
+        action = classifier.process_frame(frame)
+    print(f"Action on random array frames: {action}")
+    
     print("\nReady to process MediaPipe pose landmarks!")
     print("Call classifier.process_frame(landmarks) for each frame")
     print("Actions detected: jump, run, crouch, mountain_climber, none") 
\ No newline at end of file
@@ -0,0 +1,60 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+from joint_angle_extractor import NUM_POSE_LANDMARKS, JointAngleFeatureExtractor
+
+
+def _landmarks(points, with_visibility):
+    if with_visibility:
+        return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, visibility=1.0) for x, y in points])
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in points])
+
+
+class VisibilityTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.points = [(rng.uniform(0.05, 0.95), rng.uniform(0.05, 0.95)) for _ in range(NUM_POSE_LANDMARKS)]
+
+    def test_landmarks_without_visibility_count_as_visible(self):
+        extractor = JointAngleFeatureExtractor()
+        without = extractor.compute_all_angles(_landmarks(self.points, with_visibility=False))
+        expected = JointAngleFeatureExtractor().compute_all_angles(_landmarks(self.points, with_visibility=True))
+        self.assertEqual(without.keys(), expected.keys())
+        for name, value in expected.items():
+            self.assertAlmostEqual(without[name], value, places=9)
+
+    def test_prepare_matches_is_landmark_reliable(self):
+        extractor = JointAngleFeatureExtractor()
+        landmarks = _landmarks(self.points, with_visibility=False)
+        extractor.prepare(landmarks)
+        for idx, landmark in enumerate(landmarks.landmark):
+            self.assertEqual(bool(extractor._cache_valid[idx]), extractor.is_landmark_reliable(landmark))
+
+
+
+class CacheTest(unittest.TestCase):
+    def test_landmarks_mutated_in_place_are_reparsed(self):
+        rng = random.Random(1)
+        extractor = JointAngleFeatureExtractor()
+        landmarks = _landmarks([(rng.uniform(0.05, 0.95), rng.uniform(0.05, 0.95))
+                                for _ in range(NUM_POSE_LANDMARKS)], with_visibility=True)
+        first = (extractor.left_knee_angle(landmarks), extractor.head_turn_angle(landmarks),
+                 extractor.get_landmark_coords(landmarks, 'left_knee'))
+        
+        for landmark in landmarks.landmark:
+            landmark.x, landmark.y = rng.uniform(0.05, 0.95), rng.uniform(0.05, 0.95)
+        fresh = JointAngleFeatureExtractor()
+        expected = (fresh.left_knee_angle(landmarks), fresh.head_turn_angle(landmarks),
+                    fresh.get_landmark_coords(landmarks, 'left_knee'))
+        self.assertEqual((extractor.left_knee_angle(landmarks), extractor.head_turn_angle(landmarks),
+                          extractor.get_landmark_coords(landmarks, 'left_knee')), expected)
+        self.assertNotEqual(first, expected)
+        
+        landmarks.landmark[25].visibility = 0.0
+        self.assertIsNone(extractor.get_landmark_coords(landmarks, 'left_knee'))
+        self.assertNotIn('left_knee_angle', extractor.compute_all_angles(landmarks))
+
+
+if __name__ == "__main__":
+    unittest.main()
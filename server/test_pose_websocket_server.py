@@ -0,0 +1,30 @@
+import unittest
+
+from starlette.websockets import WebSocket
+
+from pose_websocket_server import asgi_sender
+
+
+async def _receive():
+    return {"type": "websocket.connect"}
+
+
+async def _send(message):
+    pass
+
+
+class AsgiSenderTest(unittest.TestCase):
+    def test_uses_starlette_raw_send(self):
+        """Fails if Starlette stops keeping the ASGI send as WebSocket._send"""
+        websocket = WebSocket({"type": "websocket", "path": "/ws/pose", "headers": []}, _receive, _send)
+        self.assertTrue(hasattr(websocket, "_send"))
+        self.assertIs(asgi_sender(websocket), _send)
+
+    def test_falls_back_to_public_send(self):
+        websocket = WebSocket({"type": "websocket", "path": "/ws/pose", "headers": []}, _receive, _send)
+        del websocket._send
+        self.assertEqual(asgi_sender(websocket), websocket.send)
+
+
+if __name__ == "__main__":
+    unittest.main()
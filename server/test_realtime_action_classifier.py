@@ -0,0 +1,49 @@
+import math
+import random
+import unittest
+from types import SimpleNamespace
+
+from realtime_action_classifier import FEATURE_LANDMARKS, ActionClassifier
+
+
+def _landmarks(points, with_visibility):
+    if with_visibility:
+        return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, visibility=1.0) for x, y in points])
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in points])
+
+
+class VisibilityTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.frames = [[(rng.uniform(0.05, 0.95), rng.uniform(0.05, 0.95)) for _ in range(33)]
+                       for _ in range(10)]
+
+    def _assert_frame_matches_coords(self, classifier, landmarks):
+        for slot, name in enumerate(FEATURE_LANDMARKS):
+            x, y = classifier.extract_landmark_coords(landmarks, name)
+            for got, expected in zip(classifier.frame[slot, :2], (x, y)):
+                if math.isnan(expected):
+                    self.assertTrue(math.isnan(got))
+                else:
+                    self.assertAlmostEqual(float(got), expected, places=6)
+
+    def test_landmarks_without_visibility_count_as_visible(self):
+        without = ActionClassifier()
+        expected = ActionClassifier()
+        for points in self.frames:
+            landmarks = _landmarks(points, with_visibility=False)
+            self.assertEqual(without.process_frame(landmarks),
+                             expected.process_frame(_landmarks(points, with_visibility=True)))
+            self._assert_frame_matches_coords(without, landmarks)
+        self.assertEqual(without.analyze_temporal_patterns(), expected.analyze_temporal_patterns())
+
+    def test_short_landmark_list_without_visibility(self):
+        classifier = ActionClassifier()
+        for points in self.frames:
+            landmarks = _landmarks(points[:26], with_visibility=False)
+            classifier.process_frame(landmarks)
+            self._assert_frame_matches_coords(classifier, landmarks)
+
+
+if __name__ == "__main__":
+    unittest.main()